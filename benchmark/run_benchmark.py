@@ -10,15 +10,22 @@ Compares three mapping sources side by side for 412 disagreement rows:
 Usage:
     cd desktop-app-v4
     python -m benchmark.run_benchmark
+    python -m benchmark.run_benchmark --refresh   # ignore the on-disk X-Catalog cache
 """
+import argparse
 import csv
 import os
+import pickle
 import sys
 import time
+from collections import Counter
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from tqdm import tqdm
+
 # Add parent directory to path so we can import project modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -28,8 +35,8 @@ from matcher_v4 import (
 )
 from normalizers import normalize_body, normalize_model
 from vehicle_class import identify_vehicle_class
-from mongodb_client import fetch_eurotax_trims, get_existing_mapping
-from main import extract_specs, fetch_infocar_from_xcatalog, invert_provider_code
+from mongodb_client import fetch_eurotax_trims, get_existing_mappings
+from main import extract_specs, precompute_specs, fetch_infocar_from_xcatalog, invert_provider_code
 
 # ============================================================================
 # CONFIGURATION
@@ -39,6 +46,15 @@ INPUT_CSV = r"C:\Users\lucas.gros\Downloads\comparison_export_disagreement_2026-
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)))
 MAX_WORKERS = 5
 
+# X-Catalog records found by previous runs (infocar_code -> record/used code), reused unless --refresh.
+# Codes that came back empty are not persisted: fetch_infocar_from_xcatalog returns None both for
+# "not found" and for request errors, so they are fetched again on the next run.
+XCATALOG_CACHE_PATH = os.path.join(OUTPUT_DIR, "xcatalog_cache.pkl")
+
+# Benchmark-local memoization of X-Catalog lookups for the whole run (the app keeps
+# its own short-lived TTL cache, fetch_infocar_cached, so the fetcher itself stays uncached)
+_fetch_infocar_cached = lru_cache(maxsize=10_000)(fetch_infocar_from_xcatalog)
+
 
 def load_input_csv(path: str) -> List[Dict]:
     """Load the disagreement CSV into a list of dicts."""
@@ -50,26 +66,60 @@ def load_input_csv(path: str) -> List[Dict]:
     return rows
 
 
+def load_xcatalog_cache(path: str) -> Tuple[Dict[str, Optional[Dict]], Dict[str, str]]:
+    """Load (xcatalog_cache, used_code_map) saved by a previous run, or empty dicts."""
+    if not os.path.exists(path):
+        return {}, {}
+    try:
+        with open(path, 'rb') as f:
+            xcatalog_cache, used_code_map = pickle.load(f)
+        return xcatalog_cache, used_code_map
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+        print(f"  WARNING: Ignoring unreadable X-Catalog cache {path}: {e}")
+        return {}, {}
+
+
+def save_xcatalog_cache(path: str, xcatalog_cache: Dict[str, Optional[Dict]], used_code_map: Dict[str, str]):
+    """Persist found X-Catalog records so the next run only fetches new or missing codes."""
+    found = {code: rec for code, rec in xcatalog_cache.items() if rec is not None}
+    used = {code: used_code_map[code] for code in found if code in used_code_map}
+    with open(path, 'wb') as f:
+        pickle.dump((found, used), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
 def build_natcode_lookup(eurotax_data: List[Dict]) -> Dict[str, Dict]:
-    """Build a dict[providerCode -> record] for resolving make/model/version from any natcode."""
-    lookup = {}
-    for rec in eurotax_data:
-        pcode = str(rec.get('providerCode', ''))
-        if pcode:
-            lookup[pcode] = rec
-    return lookup
+    """Build a dict[providerCode -> record] for resolving make/model/version from any natcode.
+    Uses the string natcode attached by precompute_specs."""
+    return {rec['_natcode_str']: rec for rec in eurotax_data if rec['_natcode_str']}
+
+
+@lru_cache(maxsize=50_000)
+def _trim_str(version: str) -> str:
+    """Sorted, comma-joined trim tokens for a version name (cached: many rows share names)."""
+    return ', '.join(sorted(extract_trim_tokens(version)))
+
+
+def prefetch_existing_mappings(infocar_codes: List[str]) -> Dict[str, Dict]:
+    """Fetch existing mappings for all codes (and their inverted forms) in one query.
+    Returns dict[sourceCode -> mapping document]."""
+    all_codes = set(infocar_codes)
+    for code in infocar_codes:
+        inverted = invert_provider_code(code)
+        if inverted:
+            all_codes.add(inverted)
+    return get_existing_mappings(sorted(all_codes))
 
 
 def fetch_xcatalog_for_row(infocar_code: str) -> Tuple[str, Optional[Dict], str]:
     """Fetch X-Catalog data for a single infocar_code, trying inverted code if needed.
     Returns (original_code, record_or_None, used_code)."""
-    rec = fetch_infocar_from_xcatalog(infocar_code)
+    rec = _fetch_infocar_cached(infocar_code)
     if rec:
         return (infocar_code, rec, infocar_code)
     # Try inverted code
     inverted = invert_provider_code(infocar_code)
     if inverted:
-        rec = fetch_infocar_from_xcatalog(inverted)
+        rec = _fetch_infocar_cached(inverted)
         if rec:
             return (infocar_code, rec, inverted)
     return (infocar_code, None, infocar_code)
@@ -79,6 +129,7 @@ def process_row(
     row: Dict,
     xcatalog_cache: Dict[str, Optional[Dict]],
     used_code_map: Dict[str, str],
+    existing_by_code: Dict[str, Dict],
     matcher: MatcherV4,
     natcode_lookup: Dict[str, Dict],
     weights: Dict,
@@ -100,14 +151,12 @@ def process_row(
     result['sven_model'] = row.get('our_eurotax_model', '')
     result['sven_version'] = row.get('our_eurotax_version', '')
 
-    # --- Existing mapping (from MongoDB, try both original and inverted codes) ---
-    existing_mapping = get_existing_mapping(used_code)
-    if not existing_mapping and used_code != infocar_code:
-        existing_mapping = get_existing_mapping(infocar_code)
-    if not existing_mapping:
-        inverted = invert_provider_code(infocar_code)
-        if inverted and inverted != used_code:
-            existing_mapping = get_existing_mapping(inverted)
+    # --- Existing mapping (prefetched from MongoDB, try both original and inverted codes) ---
+    lookup_codes = [used_code, infocar_code, invert_provider_code(infocar_code)]
+    existing_mapping = next(
+        (existing_by_code[code] for code in lookup_codes if code in existing_by_code),
+        None,
+    )
     existing_natcode = ''
     if existing_mapping:
         existing_natcode = str(existing_mapping.get('destCode', ''))
@@ -156,17 +205,9 @@ def process_row(
             result['v4_confidence'] = 'NO_CANDIDATES'
             result['v4_max_score'] = max_score
         else:
-            candidates = []
-            for rec in candidate_records:
-                candidates.append({
-                    'eurotax_code': rec.get('manufacturerCode', ''),
-                    'natcode': str(rec.get('providerCode', '')),
-                    'eurotax_name': rec.get('name', ''),
-                    'specs': extract_specs(rec),
-                    'vehicle_class': rec.get('_vehicle_class', vehicle_class),
-                })
-
-            ranked = rank_candidates(infocar_specs, candidates, oem_code, brand, weights=weights)
+            candidates = [rec['_candidate'] for rec in candidate_records]
+
+            ranked = rank_candidates(infocar_specs, candidates, oem_code, brand, weights=weights, limit=1)
             top = ranked[0]
 
             result['eurotax_code_v4'] = top['natcode']
@@ -178,10 +219,10 @@ def process_row(
             result['v4_max_score'] = max_score
 
     # --- Trim levels (extracted from version names) ---
-    result['infocar_trim'] = ', '.join(sorted(extract_trim_tokens(result.get('infocar_version', ''))))
-    result['existing_trim'] = ', '.join(sorted(extract_trim_tokens(result.get('existing_version', ''))))
-    result['sven_trim'] = ', '.join(sorted(extract_trim_tokens(result.get('sven_version', ''))))
-    result['v4_trim'] = ', '.join(sorted(extract_trim_tokens(result.get('v4_version', ''))))
+    result['infocar_trim'] = _trim_str(result['infocar_version'])
+    result['existing_trim'] = _trim_str(result['existing_version'])
+    result['sven_trim'] = _trim_str(result['sven_version'])
+    result['v4_trim'] = _trim_str(result['v4_version'])
 
     # --- Agreement flags ---
     v4_code = str(result.get('eurotax_code_v4', ''))
@@ -195,6 +236,14 @@ def process_row(
 
 
 def main():
+    parser = argparse.ArgumentParser(description='V4 Benchmark - Compare Mapping Sources')
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help=f'Refetch all X-Catalog records instead of reusing {os.path.basename(XCATALOG_CACHE_PATH)}'
+    )
+    args = parser.parse_args()
+
     print("=" * 70)
     print("V4 Benchmark - Compare Mapping Sources")
     print("=" * 70)
@@ -209,6 +258,10 @@ def main():
     total = len(rows)
     print(f"  Loaded {total} disagreement rows")
 
+    # Existing mappings for all codes (original + inverted) in a single query
+    existing_by_code = prefetch_existing_mappings([row['infocar_code'] for row in rows])
+    print(f"  Prefetched {len(existing_by_code)} existing mappings")
+
     # 2. Load Eurotax data and build matcher
     print(f"\n[2/5] Loading Eurotax data from MongoDB...")
     eurotax_data = fetch_eurotax_trims(country="it")
@@ -219,7 +272,10 @@ def main():
 
     print("  Building v4 matcher indexes...")
     matcher = MatcherV4(eurotax_data)
-    print(f"  Indexed {len(matcher.records_by_make):,} makes")
+    print(f"  Indexed {len(matcher.records_by_make_class):,} make/class buckets")
+
+    # Specs + candidate views are computed once per record, not once per candidate per row
+    precompute_specs(eurotax_data)
 
     # Build natcode lookup
     natcode_lookup = build_natcode_lookup(eurotax_data)
@@ -229,47 +285,56 @@ def main():
     max_score = get_max_score(weights)
 
     # 3. Fetch X-Catalog data in parallel (tries inverted code if original not found)
-    print(f"\n[3/5] Fetching X-Catalog data ({total} API calls, {MAX_WORKERS} workers)...")
+    # Rows can repeat an infocar_code: fetch each unique code once (order preserved)
+    infocar_codes = list(dict.fromkeys(row['infocar_code'] for row in rows))
     xcatalog_cache: Dict[str, Optional[Dict]] = {}
     used_code_map: Dict[str, str] = {}  # original_code -> code that worked
-    infocar_codes = [row['infocar_code'] for row in rows]
+    if not args.refresh:
+        xcatalog_cache, used_code_map = load_xcatalog_cache(XCATALOG_CACHE_PATH)
+    # Missing records are always refetched (older cache files may still hold None entries)
+    codes_to_fetch = [code for code in infocar_codes if xcatalog_cache.get(code) is None]
+    total_codes = len(codes_to_fetch)
+    print(f"\n[3/5] Fetching X-Catalog data ({total_codes} of {len(infocar_codes)} unique codes not cached, "
+          f"{MAX_WORKERS} workers)...")
 
     start_time = time.time()
-    completed = 0
     not_found = 0
     inverted_found = 0
 
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
             executor.submit(fetch_xcatalog_for_row, code): code
-            for code in infocar_codes
+            for code in codes_to_fetch
         }
-        for future in as_completed(futures):
+        for future in tqdm(as_completed(futures), total=total_codes, desc="  X-Catalog", unit="code"):
             code, rec, used_code = future.result()
             xcatalog_cache[code] = rec
             used_code_map[code] = used_code
-            completed += 1
             if rec is None:
                 not_found += 1
             elif used_code != code:
                 inverted_found += 1
-            if completed % 50 == 0 or completed == total:
-                elapsed = time.time() - start_time
-                rate = completed / elapsed if elapsed > 0 else 0
-                eta = (total - completed) / rate if rate > 0 else 0
-                print(f"  [{completed}/{total}] {rate:.1f} req/s, ETA: {eta:.0f}s, not found: {not_found}")
 
     fetch_elapsed = time.time() - start_time
+    if codes_to_fetch:
+        save_xcatalog_cache(XCATALOG_CACHE_PATH, xcatalog_cache, used_code_map)
     print(f"  X-Catalog fetch complete: {fetch_elapsed:.1f}s ({not_found} not found, {inverted_found} found via inverted code)")
 
     # 4. Process all rows
-    print(f"\n[4/5] Processing rows (matching + existing lookups)...")
-    results = []
-    for i, row in enumerate(rows):
-        result = process_row(row, xcatalog_cache, used_code_map, matcher, natcode_lookup, weights, max_score)
-        results.append(result)
-        if (i + 1) % 50 == 0 or (i + 1) == total:
-            print(f"  [{i+1}/{total}] Processing {row.get('infocar_make', '')} {row.get('infocar_model', '')}...")
+    # Rows are independent; matcher and lookups are read-only, so threads can share them
+    print(f"\n[4/5] Processing rows (matching + existing lookups, {MAX_WORKERS} workers)...")
+    results: List[Optional[Dict]] = [None] * total
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                process_row, row, xcatalog_cache, used_code_map, existing_by_code,
+                matcher, natcode_lookup, weights, max_score,
+            ): i
+            for i, row in enumerate(rows)
+        }
+        for future in tqdm(as_completed(futures), total=total, desc="  Matching", unit="row"):
+            results[futures[future]] = future.result()  # Index by row position to preserve input order
 
     # 5. Write output CSV
     timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
@@ -287,10 +352,9 @@ def main():
 
     print(f"\n[5/5] Writing output CSV...")
     with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=output_columns)
-        writer.writeheader()
-        for result in results:
-            writer.writerow(result)
+        writer = csv.writer(f)
+        writer.writerow(output_columns)
+        writer.writerows([r.get(c, '') for c in output_columns] for r in results)
 
     print(f"  Output: {output_path}")
 
@@ -299,14 +363,24 @@ def main():
     print("SUMMARY")
     print("=" * 70)
 
+    # Single pass over results for all counters
     total_processed = len(results)
-    v4_found = sum(1 for r in results if r['v4_confidence'] not in ('NOT_FOUND', 'NO_CANDIDATES'))
-    v4_not_found = sum(1 for r in results if r['v4_confidence'] == 'NOT_FOUND')
-    v4_no_candidates = sum(1 for r in results if r['v4_confidence'] == 'NO_CANDIDATES')
-    existing_found = sum(1 for r in results if r['eurotax_code_existing'])
-
-    agree_sven_v4 = sum(1 for r in results if r['agreement_sven_v4'])
-    agree_existing_v4 = sum(1 for r in results if r['agreement_existing_v4'])
+    confidence_counts = Counter()
+    existing_found = 0
+    agree_sven_v4 = 0
+    agree_existing_v4 = 0
+    for r in results:
+        confidence_counts[r['v4_confidence']] += 1
+        if r['eurotax_code_existing']:
+            existing_found += 1
+        if r['agreement_sven_v4']:
+            agree_sven_v4 += 1
+        if r['agreement_existing_v4']:
+            agree_existing_v4 += 1
+
+    v4_not_found = confidence_counts['NOT_FOUND']
+    v4_no_candidates = confidence_counts['NO_CANDIDATES']
+    v4_found = total_processed - v4_not_found - v4_no_candidates
 
     print(f"\nTotal rows:           {total_processed}")
     print(f"V4 matched:           {v4_found} ({v4_found/total_processed*100:.1f}%)")
@@ -319,15 +393,9 @@ def main():
         print(f"  Sven == V4:         {agree_sven_v4}/{v4_found} ({agree_sven_v4/v4_found*100:.1f}%)")
         print(f"  Existing == V4:     {agree_existing_v4}/{v4_found} ({agree_existing_v4/v4_found*100:.1f}%)")
 
-    # Confidence distribution
-    confidence_counts = {}
-    for r in results:
-        conf = r['v4_confidence']
-        confidence_counts[conf] = confidence_counts.get(conf, 0) + 1
-
     print(f"\nV4 confidence distribution:")
     for conf in ['PERFECT', 'LIKELY', 'POSSIBLE', 'UNLIKELY', 'NO_CANDIDATES', 'NOT_FOUND']:
-        count = confidence_counts.get(conf, 0)
+        count = confidence_counts[conf]
         if count > 0:
             print(f"  {conf:<15} {count:>4} ({count/total_processed*100:.1f}%)")
 
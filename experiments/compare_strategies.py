@@ -12,18 +12,21 @@ Reuses existing functions from:
 - matcher_v4.py: rank_candidates(), extract_trim_tokens(), all score_*() functions
 - normalizers.py: normalize_model(), normalize_fuel(), normalize_body(), etc.
 - vehicle_class.py: identify_vehicle_class()
-- main.py: extract_specs(), fetch_infocar_from_xcatalog()
-- mongodb_client.py: fetch_eurotax_trims()
+- main.py: extract_specs(), precompute_specs(), fetch_infocar_from_xcatalog()
+- mongodb_client.py: fetch_eurotax_trims(), fetch_infocar_trims()
 
 Usage:
     python compare_strategies.py [--samples N] [--output-dir DIR]
 """
 
+import heapq
 import os
 import sys
-import json
+import orjson
 import random
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
@@ -33,6 +36,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from tqdm import tqdm
 
 from matcher_v4 import (
     MatcherV4, rank_candidates, get_confidence, extract_trim_tokens,
@@ -40,8 +44,16 @@ from matcher_v4 import (
 )
 from normalizers import normalize_model, normalize_body, clean_oem_code
 from vehicle_class import identify_vehicle_class
-from main import extract_specs, fetch_infocar_from_xcatalog
-from mongodb_client import fetch_eurotax_trims, get_mongo_client
+from main import extract_specs, precompute_specs, fetch_infocar_from_xcatalog
+from mongodb_client import fetch_eurotax_trims, fetch_infocar_trims, get_mongo_client
+
+MAX_WORKERS = 5  # Parallel X-Catalog lookups (same as benchmark)
+
+# Strategy weights and max scores are fixed for the whole run
+WEIGHTS_A = WEIGHT_PROFILES['default']          # Strategy A: v4 default profile
+WEIGHTS_B = {**WEIGHTS_A, 'oem': 0}             # Strategy B: default weights but with oem=0
+MAX_SCORE_A = get_max_score(WEIGHTS_A)
+MAX_SCORE_B = get_max_score(WEIGHTS_B)
 
 
 # =============================================================================
@@ -76,33 +88,22 @@ def get_sample_mappings(
         'country': country
     }
 
-    # Get total count for sampling
-    total_count = mappings_collection.count_documents(query)
-    print(f"Total available mappings: {total_count:,}")
-
-    if total_count == 0:
-        return []
-
-    # If we need diverse makes, first get a sample of distinct makes
-    if require_diverse_makes:
-        pipeline = [
-            {'$match': query},
-            {'$sample': {'size': min(limit * 3, total_count)}},  # Get more for diversity
-        ]
-        candidates = list(mappings_collection.aggregate(pipeline))
-
-        if candidates:
-            # We'll filter for diversity later after fetching Infocar data
-            random.shuffle(candidates)
-            return candidates[:limit]
-
-    # Simple random sample
+    # Oversample when we need diverse makes (diversity is filtered later, after
+    # fetching Infocar data). $sample tolerates sizes larger than the match set,
+    # so no count_documents round-trip is needed up front.
+    sample_size = limit * 3 if require_diverse_makes else limit
     pipeline = [
         {'$match': query},
-        {'$sample': {'size': limit}}
+        {'$sample': {'size': sample_size}},
+        {'$project': {'sourceCode': 1, 'destCode': 1, '_id': 0}},  # Only fields we use
     ]
+    samples = list(mappings_collection.aggregate(pipeline, allowDiskUse=False))
+    print(f"Sampled mappings: {len(samples):,}")
 
-    return list(mappings_collection.aggregate(pipeline))
+    if require_diverse_makes:
+        random.shuffle(samples)
+
+    return samples[:limit]
 
 
 # =============================================================================
@@ -113,7 +114,8 @@ def find_candidates_make_model_only(
     matcher: MatcherV4,
     brand: str,
     model: str,
-    vehicle_class: str
+    vehicle_class: str,
+    records: Optional[List[Dict]] = None
 ) -> List[Dict]:
     """
     Alternative Stage 1: Filter only by make+model+class (no OEM).
@@ -127,6 +129,9 @@ def find_candidates_make_model_only(
         brand: Normalized make (uppercase)
         model: Normalized model (lowercase)
         vehicle_class: VehicleClass.CAR or VehicleClass.LCV
+        records: Optional pool to filter instead of the make+class bucket.
+            Strategy A's candidates can be passed here: its containment checks
+            are a superset of these, so the result (and its order) is the same.
 
     Returns:
         List of matching candidate records
@@ -137,23 +142,21 @@ def find_candidates_make_model_only(
     brand = brand.upper().strip()
     model = model.lower().strip()
 
-    same_make = matcher.records_by_make.get(brand, [])
+    same_make = records if records is not None else matcher.records_by_make_class.get((brand, vehicle_class), [])
     matches = []
 
     # Normalize source model (expand abbreviations, remove year suffixes)
     source_model_norm = normalize_model(model)
 
+    # Records are already restricted to the vehicle class (make+class bucket,
+    # or Strategy A's candidates, which come from the same bucket)
     for rec in same_make:
-        # Check vehicle class (same as current fallback)
-        if rec.get('_vehicle_class') != vehicle_class:
-            continue
-
-        eurotax_model = (rec.get('normalizedModel') or '').lower().strip()
+        # Lowercased and normalized model precomputed at index time (MatcherV4.__init__)
+        eurotax_model = rec['_model_lc']
         if not eurotax_model:
             continue
 
-        # Normalize target model
-        target_model_norm = normalize_model(eurotax_model)
+        target_model_norm = rec['_normalized_model']
 
         # Model containment (either direction) using normalized names
         # EXACT same logic as matcher_v3.py lines 211-214
@@ -173,7 +176,8 @@ def find_candidates_make_model_only(
 def run_single_comparison(
     matcher: MatcherV4,
     infocar_code: str,
-    ground_truth_natcode: str
+    ground_truth_natcode: str,
+    infocar_by_code: Optional[Dict[str, Dict]] = None
 ) -> Optional[Dict]:
     """
     Run both strategies on a single Infocar code and compare results.
@@ -182,12 +186,15 @@ def run_single_comparison(
         matcher: MatcherV4 instance
         infocar_code: Infocar provider code
         ground_truth_natcode: Expected Eurotax natcode from mapping
+        infocar_by_code: Optional prefetched Infocar records (providerCode -> record)
 
     Returns:
         Comparison result dict, or None if Infocar data not found
     """
-    # Fetch Infocar data from X-Catalog
-    infocar_rec = fetch_infocar_from_xcatalog(infocar_code)
+    # Use prefetched Infocar data, falling back to X-Catalog for codes not in the batch
+    infocar_rec = (infocar_by_code or {}).get(infocar_code)
+    if not infocar_rec:
+        infocar_rec = fetch_infocar_from_xcatalog(infocar_code)
 
     if not infocar_rec:
         return None
@@ -208,41 +215,24 @@ def run_single_comparison(
     # =========================================================================
     candidates_a_records = matcher.find_candidates(brand, model, vehicle_class)
 
-    # Build candidate dicts with specs for ranking
-    candidates_a_with_specs = []
-    for rec in candidates_a_records:
-        candidates_a_with_specs.append({
-            'eurotax_code': rec.get('manufacturerCode', ''),
-            'natcode': str(rec.get('providerCode', '')),
-            'eurotax_name': rec.get('name', ''),
-            'specs': extract_specs(rec),
-            'vehicle_class': rec.get('_vehicle_class', vehicle_class)
-        })
-
-    weights_a = WEIGHT_PROFILES['default']
-    ranked_a = rank_candidates(infocar_specs, candidates_a_with_specs, oem_code, brand, weights=weights_a)
+    # Candidate dicts with specs are prebuilt per record (precompute_specs)
+    candidates_a_with_specs = [rec['_candidate'] for rec in candidates_a_records]
+
+    ranked_a = rank_candidates(infocar_specs, candidates_a_with_specs, oem_code, brand, weights=WEIGHTS_A, limit=1)
     top_a = ranked_a[0] if ranked_a else None
 
     # =========================================================================
     # STRATEGY B: Make+Model only (no OEM scoring)
     # =========================================================================
-    candidates_b = find_candidates_make_model_only(matcher, brand, model, vehicle_class)
-
-    # Build candidate dicts with specs for ranking
-    candidates_b_with_specs = []
-    for rec in candidates_b:
-        candidates_b_with_specs.append({
-            'eurotax_code': rec.get('manufacturerCode', ''),
-            'natcode': str(rec.get('providerCode', '')),
-            'eurotax_name': rec.get('name', ''),
-            'specs': extract_specs(rec),
-            'vehicle_class': rec.get('_vehicle_class', vehicle_class)
-        })
-
-    # Strategy B: use default weights but with oem=0
-    weights_b = dict(weights_a)
-    weights_b['oem'] = 0
-    ranked_b = rank_candidates(infocar_specs, candidates_b_with_specs, oem_code, brand, weights=weights_b)
+    # Strategy B's matches are a subset of Strategy A's: filter those instead of rescanning the make
+    candidates_b = find_candidates_make_model_only(
+        matcher, brand, model, vehicle_class, records=candidates_a_records
+    )
+
+    # Candidate dicts with specs are prebuilt per record (precompute_specs)
+    candidates_b_with_specs = [rec['_candidate'] for rec in candidates_b]
+
+    ranked_b = rank_candidates(infocar_specs, candidates_b_with_specs, oem_code, brand, weights=WEIGHTS_B, limit=1)
     top_b = ranked_b[0] if ranked_b else None
 
     # =========================================================================
@@ -263,7 +253,7 @@ def run_single_comparison(
             'top_natcode': top_a['natcode'] if top_a else None,
             'top_name': top_a['eurotax_name'] if top_a else None,
             'top_score': top_a['score'] if top_a else None,
-            'max_score': get_max_score(weights_a),
+            'max_score': MAX_SCORE_A,
         },
 
         # Strategy B results (no OEM scoring)
@@ -272,7 +262,7 @@ def run_single_comparison(
             'top_natcode': top_b['natcode'] if top_b else None,
             'top_name': top_b['eurotax_name'] if top_b else None,
             'top_score': top_b['score'] if top_b else None,
-            'max_score': get_max_score(weights_b),
+            'max_score': MAX_SCORE_B,
         },
     }
 
@@ -317,42 +307,25 @@ def run_comparison(
     Returns:
         Dict with all results and summary statistics
     """
-    print("Loading Eurotax data from MongoDB...")
+    print("Loading Eurotax data from MongoDB (deduplicated server-side)...")
     eurotax_data = fetch_eurotax_trims(country="it")
 
     if not eurotax_data:
         print("ERROR: No Eurotax data loaded. Check VPN connection.")
         return {'error': 'No Eurotax data'}
 
-    # Deduplicate by natcode (keep most complete record)
-    important_fields = [
-        'name', 'manufacturerCode', 'powerHp', 'powerKw', 'cc',
-        'price', 'fuelType', 'bodyType', 'doors', 'gears',
-        'gearType', 'tractionType', 'seats', 'mass'
-    ]
-
-    by_natcode = {}
-    for rec in eurotax_data:
-        natcode = rec.get('providerCode')
-        if not natcode:
-            continue
-        natcode_str = str(natcode)
-        if natcode_str not in by_natcode:
-            by_natcode[natcode_str] = rec
-        else:
-            existing_score = sum(1 for f in important_fields if by_natcode[natcode_str].get(f))
-            new_score = sum(1 for f in important_fields if rec.get(f))
-            if new_score > existing_score:
-                by_natcode[natcode_str] = rec
-
-    eurotax_data = list(by_natcode.values())
+    # Already deduplicated by natcode server-side (fetch_eurotax_trims keeps the
+    # most complete record per providerCode), so no client-side pass is needed
     print(f"Loaded {len(eurotax_data):,} Eurotax records (deduplicated)")
 
     # Build matcher
     print("Building matcher indexes...")
     matcher = MatcherV4(eurotax_data)
     print(f"Indexed {len(matcher.exact_oem_index):,} OEM codes")
-    print(f"Indexed {len(matcher.records_by_make):,} makes")
+    print(f"Indexed {len(matcher.records_by_make_class):,} make/class buckets")
+
+    # Specs + candidate views are computed once per record, not once per candidate per sample
+    precompute_specs(eurotax_data)
 
     # Run comparisons
     results = []
@@ -371,20 +344,38 @@ def run_comparison(
         'makes': {}
     }
 
-    print(f"\nProcessing {len(samples)} samples...")
-
-    for i, mapping in enumerate(samples):
-        source_code = str(mapping.get('sourceCode', ''))
-        dest_code = str(mapping.get('destCode', ''))
-
-        if progress_callback:
-            progress_callback(i + 1, len(samples))
-
-        if (i + 1) % 20 == 0:
-            print(f"  Progress: {i + 1}/{len(samples)} ({(i + 1) * 100 // len(samples)}%)")
-
-        result = run_single_comparison(matcher, source_code, dest_code)
-
+    total = len(samples)
+
+    # Bulk-read all Infocar records in one MongoDB query instead of one API call per sample
+    print("Prefetching Infocar records from MongoDB...")
+    source_codes = {str(mapping.get('sourceCode', '')) for mapping in samples}
+    infocar_by_code = fetch_infocar_trims(list(source_codes))
+    print(f"Prefetched {len(infocar_by_code):,} Infocar records "
+          f"({len(source_codes - infocar_by_code.keys()):,} codes fall back to X-Catalog)")
+
+    print(f"\nProcessing {total} samples ({MAX_WORKERS} workers)...")
+
+    # Comparisons are independent and dominated by X-Catalog latency: run them
+    # in parallel, then aggregate serially in sample order (no shared-state locking)
+    comparison_results: List[Optional[Dict]] = [None] * total
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                run_single_comparison, matcher,
+                str(mapping.get('sourceCode', '')), str(mapping.get('destCode', '')),
+                infocar_by_code,
+            ): i
+            for i, mapping in enumerate(samples)
+        }
+        progress = tqdm(as_completed(futures), total=total, desc="  Comparing", unit="sample")
+        for completed, future in enumerate(progress, 1):
+            comparison_results[futures[future]] = future.result()
+
+            if progress_callback:
+                progress_callback(completed, total)
+
+    for result in comparison_results:
         if result is None:
             stats['skipped_not_found'] += 1
             continue
@@ -437,6 +428,88 @@ def run_comparison(
 # REPORT GENERATION
 # =============================================================================
 
+# Write buffer size for report files
+REPORT_WRITE_BUFFER = 1 << 20
+
+# Static report sections (identical for every run)
+STRATEGY_DESCRIPTIONS = """\
+--------------------------------------------------------------------------------
+STRATEGY DESCRIPTIONS
+--------------------------------------------------------------------------------
+
+Strategy A (v4 default profile):
+  - Make+model candidate selection, OEM as regular scoring field
+  - OEM: exact +10, cleaned +5, none 0
+  - Max score: 140 pts
+
+Strategy B (No OEM scoring):
+  - Same candidate selection as A (make+model)
+  - OEM weight set to 0
+  - Max score: 130 pts
+
+"""
+
+REVIEW_SUMMARY = """\
+================================================================================
+REVIEW SUMMARY
+================================================================================
+
+After reviewing divergences, tally your results:
+
+  A correct:     ____
+  B correct:     ____
+  Both valid:    ____
+  Neither:       ____
+
+Recommendation: _______________________________________________
+"""
+
+
+SUMMARY_FOOTER = """
+## Next Steps
+
+1. Review `divergence_report.md` to manually assess each divergence
+2. For each divergence, determine which strategy picked the better match
+3. Tally results to make final recommendation
+
+---
+
+*See `divergence_report.md` for detailed divergence analysis.*"""
+
+
+# One divergence entry in the divergence report (filled with str.format_map)
+DIVERGENCE_TEMPLATE = (
+    "=" * 80 + "\n"
+    "DIVERGENCE #{i}: Infocar {infocar_code}\n"
+    + "=" * 80 + "\n"
+    "Source: {brand} {model} - {infocar_name}\n"
+    "OEM Code: {oem_code}\n"
+    "Vehicle Class: {vehicle_class}\n"
+    "\n"
+    "STRATEGY A (v4 default):\n"
+    "  Candidates: {a_candidates}\n"
+    "{a_top}"
+    "\n"
+    "STRATEGY B (No OEM):\n"
+    "  Candidates: {b_candidates}\n"
+    "{b_top}"
+    "\n"
+    "COMPARISON:\n"
+    "{comparison}"
+    "\n"
+    "MANUAL REVIEW: [ ] A is correct  [ ] B is correct  [ ] Both valid  [ ] Neither\n"
+    "\n"
+)
+
+
+def _format_top_match(strategy: Dict) -> str:
+    """Format a strategy's top match lines for the divergence report."""
+    if strategy['top_natcode']:
+        return (f"  Top: natcode={strategy['top_natcode']}, score={strategy['top_score']}/{strategy['max_score']}\n"
+                f"       Name: {strategy['top_name']}\n")
+    return "  Top: NO MATCH FOUND\n"
+
+
 def generate_divergence_report(results: Dict, output_dir: str) -> str:
     """
     Generate detailed divergence report.
@@ -451,125 +524,93 @@ def generate_divergence_report(results: Dict, output_dir: str) -> str:
     divergences = results.get('divergences', [])
     stats = results.get('stats', {})
 
-    lines = []
-    lines.append("=" * 80)
-    lines.append("MATCHING STRATEGY COMPARISON: DIVERGENCE REPORT")
-    lines.append("=" * 80)
-    lines.append("")
-    lines.append(f"Generated: {datetime.now().isoformat()}")
-    lines.append(f"Total samples processed: {stats.get('processed', 0)}")
-    lines.append(f"Total divergences: {stats.get('divergences', 0)}")
-    lines.append(f"Agreement rate: {stats.get('agreement_rate', 0):.1f}%")
-    lines.append("")
-
-    # Strategy descriptions
-    lines.append("-" * 80)
-    lines.append("STRATEGY DESCRIPTIONS")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append("Strategy A (v4 default profile):")
-    lines.append("  - Make+model candidate selection, OEM as regular scoring field")
-    lines.append("  - OEM: exact +10, cleaned +5, none 0")
-    lines.append("  - Max score: 140 pts")
-    lines.append("")
-    lines.append("Strategy B (No OEM scoring):")
-    lines.append("  - Same candidate selection as A (make+model)")
-    lines.append("  - OEM weight set to 0")
-    lines.append("  - Max score: 130 pts")
-    lines.append("")
-
-    # Summary statistics
-    lines.append("-" * 80)
-    lines.append("SUMMARY STATISTICS")
-    lines.append("-" * 80)
-    lines.append("")
-    lines.append(f"Processed:             {stats.get('processed', 0):,}")
-    lines.append(f"Skipped (not found):   {stats.get('skipped_not_found', 0):,}")
-    lines.append("")
-    lines.append(f"Agreements:            {stats.get('agreements', 0):,} ({stats.get('agreement_rate', 0):.1f}%)")
-    lines.append(f"Divergences:           {stats.get('divergences', 0):,} ({stats.get('divergence_rate', 0):.1f}%)")
-    lines.append("")
-
-    # Make distribution
-    lines.append("Make Distribution (top 15):")
-    makes = sorted(stats.get('makes', {}).items(), key=lambda x: -x[1])[:15]
-    for make, count in makes:
-        pct = count / stats.get('processed', 1) * 100
-        lines.append(f"  {make:20s} {count:4,} ({pct:5.1f}%)")
-    lines.append("")
-
-    # Divergence details
-    lines.append("=" * 80)
-    lines.append("DIVERGENCE DETAILS")
-    lines.append("=" * 80)
-    lines.append("")
-    lines.append("For each divergence, compare Strategy A vs Strategy B to determine")
-    lines.append("which produced the better match. Mark your assessment at the end.")
-    lines.append("")
-
-    for i, div in enumerate(divergences, 1):
-        lines.append("=" * 80)
-        lines.append(f"DIVERGENCE #{i}: Infocar {div['infocar_code']}")
-        lines.append("=" * 80)
-        lines.append(f"Source: {div['brand']} {div['model']} - {div['infocar_name']}")
-        lines.append(f"OEM Code: {div['oem_code']}")
-        lines.append(f"Vehicle Class: {div['vehicle_class']}")
-        lines.append("")
-
-        # Strategy A
-        a = div['strategy_a']
-        lines.append("STRATEGY A (v4 default):")
-        lines.append(f"  Candidates: {a['candidate_count']}")
-        if a['top_natcode']:
-            lines.append(f"  Top: natcode={a['top_natcode']}, score={a['top_score']}/{a['max_score']}")
-            lines.append(f"       Name: {a['top_name']}")
-        else:
-            lines.append("  Top: NO MATCH FOUND")
-        lines.append("")
-
-        # Strategy B
-        b = div['strategy_b']
-        lines.append("STRATEGY B (No OEM):")
-        lines.append(f"  Candidates: {b['candidate_count']}")
-        if b['top_natcode']:
-            lines.append(f"  Top: natcode={b['top_natcode']}, score={b['top_score']}/{b['max_score']}")
-            lines.append(f"       Name: {b['top_name']}")
-        else:
-            lines.append("  Top: NO MATCH FOUND")
-        lines.append("")
-
-        # Comparison
-        lines.append("COMPARISON:")
-        if a['top_score'] and b['top_score']:
-            lines.append(f"  A score: {a['top_score']}/{a['max_score']} vs B score: {b['top_score']}/{b['max_score']}")
-            lines.append(f"  Score winner: {div['score_winner']}")
-        lines.append("")
-
-        # Manual review checkbox
-        lines.append("MANUAL REVIEW: [ ] A is correct  [ ] B is correct  [ ] Both valid  [ ] Neither")
-        lines.append("")
-
-    # Summary section
-    lines.append("=" * 80)
-    lines.append("REVIEW SUMMARY")
-    lines.append("=" * 80)
-    lines.append("")
-    lines.append("After reviewing divergences, tally your results:")
-    lines.append("")
-    lines.append("  A correct:     ____")
-    lines.append("  B correct:     ____")
-    lines.append("  Both valid:    ____")
-    lines.append("  Neither:       ____")
-    lines.append("")
-    lines.append("Recommendation: _______________________________________________")
-    lines.append("")
-
-    report_content = '\n'.join(lines)
-
-    # Write report
+    processed = stats.get('processed', 0)
+    agreements = stats.get('agreements', 0)
+    agreement_rate = stats.get('agreement_rate', 0)
+    divergence_count = stats.get('divergences', 0)
+    divergence_rate = stats.get('divergence_rate', 0)
+    makes = stats.get('makes', {})
+
     report_path = os.path.join(output_dir, 'divergence_report.md')
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report_content)
+    # Sections are written straight to a large write buffer (no full in-memory copy)
+    with open(report_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+        f.write(f"""\
+{"=" * 80}
+MATCHING STRATEGY COMPARISON: DIVERGENCE REPORT
+{"=" * 80}
+
+Generated: {datetime.now().isoformat()}
+Total samples processed: {processed}
+Total divergences: {divergence_count}
+Agreement rate: {agreement_rate:.1f}%
+
+""")
+
+        # Strategy descriptions
+        f.write(STRATEGY_DESCRIPTIONS)
+
+        # Summary statistics
+        f.write(f"""\
+{"-" * 80}
+SUMMARY STATISTICS
+{"-" * 80}
+
+Processed:             {processed:,}
+Skipped (not found):   {stats.get('skipped_not_found', 0):,}
+
+Agreements:            {agreements:,} ({agreement_rate:.1f}%)
+Divergences:           {divergence_count:,} ({divergence_rate:.1f}%)
+
+""")
+
+        # Make distribution
+        f.write("Make Distribution (top 15):\n")
+        pct_denominator = stats.get('processed', 1) or 1
+        for make, count in heapq.nlargest(15, makes.items(), key=itemgetter(1)):
+            pct = count / pct_denominator * 100
+            f.write(f"  {make:20s} {count:4,} ({pct:5.1f}%)\n")
+        f.write("\n")
+
+        # Divergence details
+        f.write(f"""\
+{"=" * 80}
+DIVERGENCE DETAILS
+{"=" * 80}
+
+For each divergence, compare Strategy A vs Strategy B to determine
+which produced the better match. Mark your assessment at the end.
+
+""")
+
+        for i, div in enumerate(divergences, 1):
+            a = div['strategy_a']
+            b = div['strategy_b']
+
+            a_score = a['top_score']
+            b_score = b['top_score']
+            if a_score and b_score:
+                comparison = (f"  A score: {a_score}/{a['max_score']} vs B score: {b_score}/{b['max_score']}\n"
+                              f"  Score winner: {div['score_winner']}\n")
+            else:
+                comparison = ""
+
+            f.write(DIVERGENCE_TEMPLATE.format_map({
+                'i': i,
+                'infocar_code': div['infocar_code'],
+                'brand': div['brand'],
+                'model': div['model'],
+                'infocar_name': div['infocar_name'],
+                'oem_code': div['oem_code'],
+                'vehicle_class': div['vehicle_class'],
+                'a_candidates': a['candidate_count'],
+                'a_top': _format_top_match(a),
+                'b_candidates': b['candidate_count'],
+                'b_top': _format_top_match(b),
+                'comparison': comparison,
+            }))
+
+        # Summary section
+        f.write(REVIEW_SUMMARY)
 
     return report_path
 
@@ -588,68 +629,73 @@ def generate_summary(results: Dict, output_dir: str) -> str:
     stats = results.get('stats', {})
     divergences = results.get('divergences', [])
 
-    lines = []
-    lines.append("# Strategy Comparison Summary")
-    lines.append("")
-    lines.append(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    lines.append("")
-
-    lines.append("## Test Overview")
-    lines.append("")
-    lines.append("| Metric | Value |")
-    lines.append("|--------|-------|")
-    lines.append(f"| Total Samples | {stats.get('processed', 0):,} |")
-    lines.append(f"| Agreements | {stats.get('agreements', 0):,} ({stats.get('agreement_rate', 0):.1f}%) |")
-    lines.append(f"| Divergences | {stats.get('divergences', 0):,} ({stats.get('divergence_rate', 0):.1f}%) |")
-    lines.append("")
-
-    lines.append("## Divergence Score Comparison")
-    lines.append("")
-    lines.append("When strategies disagree on the top candidate:")
-    lines.append("")
-
-    # Calculate score winner distribution for divergences
-    a_wins_score = sum(1 for d in divergences if d.get('score_winner') == 'A')
-    b_wins_score = sum(1 for d in divergences if d.get('score_winner') == 'B')
-    ties = sum(1 for d in divergences if d.get('score_winner') == 'TIE')
-
-    lines.append("| Score Winner | Count |")
-    lines.append("|--------------|-------|")
-    lines.append(f"| A (default profile) higher | {a_wins_score} |")
-    lines.append(f"| B (no OEM) higher | {b_wins_score} |")
-    lines.append(f"| Tie (same score) | {ties} |")
-    lines.append("")
-
-    lines.append("## Candidate Count Comparison")
-    lines.append("")
-
-    # Calculate average candidate counts
-    if divergences:
-        avg_a_candidates = sum(d['strategy_a']['candidate_count'] for d in divergences) / len(divergences)
-        avg_b_candidates = sum(d['strategy_b']['candidate_count'] for d in divergences) / len(divergences)
-        lines.append(f"- Strategy A average candidates: {avg_a_candidates:.1f}")
-        lines.append(f"- Strategy B average candidates: {avg_b_candidates:.1f}")
-        lines.append("")
-        lines.append(f"Strategy B finds {avg_b_candidates/avg_a_candidates:.1f}x more candidates on average")
-    lines.append("")
-
-    lines.append("## Next Steps")
-    lines.append("")
-    lines.append("1. Review `divergence_report.md` to manually assess each divergence")
-    lines.append("2. For each divergence, determine which strategy picked the better match")
-    lines.append("3. Tally results to make final recommendation")
-    lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("*See `divergence_report.md` for detailed divergence analysis.*")
-
-    summary_content = '\n'.join(lines)
-
-    # Write summary
+    processed = stats.get('processed', 0)
+    agreements = stats.get('agreements', 0)
+    agreement_rate = stats.get('agreement_rate', 0)
+    divergence_count = stats.get('divergences', 0)
+    divergence_rate = stats.get('divergence_rate', 0)
+
     summary_path = os.path.join(output_dir, 'summary.md')
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        f.write(summary_content)
+    # Sections are written straight to a large write buffer (no full in-memory copy)
+    with open(summary_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+        f.write(f"""\
+# Strategy Comparison Summary
+
+**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
+
+## Test Overview
+
+| Metric | Value |
+|--------|-------|
+| Total Samples | {processed:,} |
+| Agreements | {agreements:,} ({agreement_rate:.1f}%) |
+| Divergences | {divergence_count:,} ({divergence_rate:.1f}%) |
+
+## Divergence Score Comparison
+
+When strategies disagree on the top candidate:
+
+""")
+
+        # Score winner distribution and candidate totals in a single pass over divergences
+        a_wins_score = 0
+        b_wins_score = 0
+        ties = 0
+        total_a_candidates = 0
+        total_b_candidates = 0
+        for d in divergences:
+            winner = d.get('score_winner')
+            if winner == 'A':
+                a_wins_score += 1
+            elif winner == 'B':
+                b_wins_score += 1
+            elif winner == 'TIE':
+                ties += 1
+            total_a_candidates += d['strategy_a']['candidate_count']
+            total_b_candidates += d['strategy_b']['candidate_count']
+
+        f.write(f"""\
+| Score Winner | Count |
+|--------------|-------|
+| A (default profile) higher | {a_wins_score} |
+| B (no OEM) higher | {b_wins_score} |
+| Tie (same score) | {ties} |
+
+## Candidate Count Comparison
+
+""")
+
+        # Calculate average candidate counts
+        if divergences:
+            avg_a_candidates = total_a_candidates / len(divergences)
+            avg_b_candidates = total_b_candidates / len(divergences)
+            f.write(f"""\
+- Strategy A average candidates: {avg_a_candidates:.1f}
+- Strategy B average candidates: {avg_b_candidates:.1f}
+
+Strategy B finds {avg_b_candidates/avg_a_candidates:.1f}x more candidates on average
+""")
+        f.write(SUMMARY_FOOTER)
 
     return summary_path
 
@@ -673,8 +719,8 @@ def save_raw_results(results: Dict, output_dir: str) -> str:
     }
 
     json_path = os.path.join(output_dir, 'results.json')
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(serializable, f, indent=2, ensure_ascii=False)
+    with open(json_path, 'wb') as f:
+        f.write(orjson.dumps(serializable, option=orjson.OPT_INDENT_2))
 
     return json_path
 
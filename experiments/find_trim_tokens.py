@@ -25,6 +25,9 @@ if not MONGO_URI:
     print("ERROR: MONGO_URI not set. Check .env file.")
     sys.exit(1)
 
+# Documents per cursor batch when streaming names
+CURSOR_BATCH_SIZE = 5000
+
 # ---- Known trim tokens to EXCLUDE (already cataloged) ----
 KNOWN_TRIMS = {
     "sport", "sportline", "s-line", "s line", "sline", "amg", "m sport",
@@ -47,11 +50,8 @@ KNOWN_TRIMS = {
     "awd", "4x4", "4wd", "traction",
 }
 
-# Single-word tokens from the known set for quick lookup
-KNOWN_SINGLE_TOKENS = set()
-for t in KNOWN_TRIMS:
-    for word in t.split():
-        KNOWN_SINGLE_TOKENS.add(word.lower())
+# Single-word tokens from the known set for quick lookup (entries are already lowercase)
+KNOWN_SINGLE_TOKENS = {word for t in KNOWN_TRIMS for word in t.split()}
 
 # ---- Words to exclude (not trim levels) ----
 # Common car makes
@@ -186,29 +186,30 @@ EXCLUDE_PATTERNS = [
     r'^\(\d+\)$',         # Numbers in parens
 ]
 
+# Every word excluded by exact match, for a single membership test
+EXCLUDED_WORDS = frozenset().union(KNOWN_SINGLE_TOKENS, MAKES, MODELS, TECHNICAL_WORDS)
+
+# Name delimiters (besides whitespace) mapped to spaces, so str.split() tokenizes
+NAME_DELIMITERS = str.maketrans('/,()[]+', ' ' * 7)
+
+# All exclusion patterns as one compiled alternation (a single match call per word)
+EXCLUDE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in EXCLUDE_PATTERNS))
+
 
 def should_exclude(word: str) -> bool:
-    """Check if a word should be excluded from trim analysis."""
+    """Check if a word should be excluded from trim analysis (cheapest checks first)."""
     w = word.lower().strip()
 
     # Too short
     if len(w) < 3:
         return True
 
-    # In known trim tokens
-    if w in KNOWN_SINGLE_TOKENS:
-        return True
-
-    # In exclusion sets
-    if w in MAKES or w in MODELS or w in TECHNICAL_WORDS:
+    # In known trim tokens or exclusion sets (makes, models, technical words)
+    if w in EXCLUDED_WORDS:
         return True
 
     # Matches exclusion patterns
-    for pattern in EXCLUDE_PATTERNS:
-        if re.match(pattern, w):
-            return True
-
-    return False
+    return EXCLUDE_RE.match(w) is not None
 
 
 def main():
@@ -218,9 +219,11 @@ def main():
     collection = db['trims']
 
     print("Querying Italian Eurotax trims (name field only)...")
+    # Large batches: ~500K small name-only documents, so fewer getMore round-trips
     cursor = collection.find(
         {'country': 'it', '_source': 'eurotax'},
-        {'name': 1, '_id': 0}
+        {'name': 1, '_id': 0},
+        batch_size=CURSOR_BATCH_SIZE,
     )
 
     # Count words across all names
@@ -241,18 +244,15 @@ def main():
         name_lower = name.lower().strip()
 
         # Split on whitespace and common delimiters
-        tokens = re.split(r'[\s/,\(\)\[\]\+]+', name_lower)
+        tokens = name_lower.translate(NAME_DELIMITERS).split()
 
         # Also add hyphenated compounds as single tokens
         # e.g., "n-line" stays as "n-line" in addition to "n" and "line"
-        seen_in_name = set()
-        for token in tokens:
-            token = token.strip('.-_')
-            if not token:
-                continue
-            if token not in seen_in_name:
-                seen_in_name.add(token)
-                word_counter[token] += 1
+        # Each token counts once per name (ordered dedup keeps first-seen order
+        # for frequency ties), counted in C by Counter.update
+        unique_tokens = dict.fromkeys(token.strip('.-_') for token in tokens)
+        unique_tokens.pop('', None)
+        word_counter.update(unique_tokens.keys())
 
     print(f"\nTotal records: {total_records}")
     print(f"Records without name: {names_with_no_name}")
@@ -268,14 +268,16 @@ def main():
     # Sort by frequency descending
     sorted_candidates = sorted(candidates.items(), key=lambda x: -x[1])
 
-    print(f"\n{'='*60}")
-    print(f"POTENTIAL TRIM TOKENS (appearing in {MIN_COUNT}+ vehicle names)")
-    print(f"{'='*60}")
-    print(f"{'Rank':<6} {'Token':<30} {'Count':<10}")
-    print(f"{'-'*6} {'-'*30} {'-'*10}")
-
-    for i, (word, count) in enumerate(sorted_candidates, 1):
-        print(f"{i:<6} {word:<30} {count:<10}")
+    # Header and table rows are built in memory and written with a single call
+    header = [
+        f"\n{'='*60}",
+        f"POTENTIAL TRIM TOKENS (appearing in {MIN_COUNT}+ vehicle names)",
+        f"{'='*60}",
+        f"{'Rank':<6} {'Token':<30} {'Count':<10}",
+        f"{'-'*6} {'-'*30} {'-'*10}",
+    ]
+    rows = (f"{i:<6} {word:<30} {count:<10}" for i, (word, count) in enumerate(sorted_candidates, 1))
+    sys.stdout.write('\n'.join([*header, *rows]) + '\n')
 
     print(f"\n{'='*60}")
     print(f"Total candidate trim tokens: {len(sorted_candidates)}")
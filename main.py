@@ -7,19 +7,25 @@ Key change from v3: OEM is a regular scoring field, not a candidate selection ga
 - OEM match scored per-candidate: exact +10, cleaned +5, none 0
 - 157 point maximum score
 """
+import asyncio
 import os
 import sys
 import time
 import webbrowser
 import threading
 from contextlib import asynccontextmanager
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from collections import OrderedDict, defaultdict
 from typing import Optional, List, Dict, Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
@@ -40,6 +46,9 @@ from mongodb_client import fetch_eurotax_trims, test_connection
 X_CATALOG_BASE_URL = "https://x-catalogue.motork.io"
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 REFRESH_INTERVAL = 3600  # Refresh data every hour (in seconds)
+XCATALOG_CACHE_TTL = 900  # Keep X-Catalog lookups for 15 minutes (repeat searches of a code)
+XCATALOG_CACHE_SIZE = 10_000
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)  # sellableWindow timestamps are epoch ms
 
 
 # ============================================================================
@@ -60,49 +69,88 @@ def load_eurotax_data():
     global eurotax_data, natcode_lookup, matcher, data_loaded, data_load_error, last_refresh_time, refresh_count
 
     try:
+        # Build the new data set off to the side; request threads keep reading the
+        # previous one until the single swap below (no half-built state is visible)
         print("Loading Eurotax data from MongoDB (deduplicated server-side)...")
-        eurotax_data = fetch_eurotax_trims(country="it")
+        new_data = fetch_eurotax_trims(country="it")
 
-        if not eurotax_data:
+        if not new_data:
             data_load_error = "No Eurotax data returned from MongoDB. Check VPN connection."
             print(f"ERROR: {data_load_error}")
             return
 
-        print(f"  Eurotax unique records: {len(eurotax_data):,}")
-
         # Build v4 matcher
-        print("Building v4 matcher indexes...")
-        matcher = MatcherV4(eurotax_data)
+        new_matcher = MatcherV4(new_data)
+
+        # Precompute specs + candidate views once per load (reused by every search)
+        precompute_specs(new_data)
 
         # Build natcode lookup for direct eurotax record access
-        natcode_lookup = {}
-        for rec in eurotax_data:
-            pc = str(rec.get('providerCode', ''))
-            if pc:
-                natcode_lookup[pc] = rec
-        print(f"  Built natcode lookup: {len(natcode_lookup):,} entries")
+        # (string natcodes were attached by precompute_specs)
+        new_lookup = {
+            rec['_natcode_str']: rec for rec in new_data
+            if rec['_natcode_str']
+        }
 
-        print(f"  Indexed {len(matcher.exact_oem_index):,} exact OEM codes (for scoring)")
-        print(f"  Indexed {len(matcher.records_by_make):,} makes for candidate selection")
+        # Publish all three together
+        eurotax_data, natcode_lookup, matcher = new_data, new_lookup, new_matcher
 
         last_refresh_time = time.time()
         refresh_count += 1
         data_loaded = True
         data_load_error = None  # Clear any previous error
 
-        print(f"  Data loaded successfully (refresh #{refresh_count})")
+        # One status message per load (a single stdout write, not interleaved with request logs)
+        print(
+            f"  Eurotax unique records: {len(new_data):,}\n"
+            f"  Built natcode lookup: {len(new_lookup):,} entries\n"
+            f"  Indexed {len(new_matcher.exact_oem_index):,} exact OEM codes (for scoring)\n"
+            f"  Indexed {len(new_matcher.records_by_make_class):,} make/class buckets for candidate selection\n"
+            f"  Data loaded successfully (refresh #{refresh_count})"
+        )
 
     except Exception as e:
         data_load_error = str(e)
         print(f"Error loading Eurotax data: {e}")
 
 
-def refresh_data_periodically():
-    """Background thread to refresh data every hour."""
+async def run_in_daemon_thread(func) -> None:
+    """Run a blocking function on a daemon thread and wait for it to finish.
+
+    Unlike the default executor, a daemon thread does not hold up shutdown:
+    cancelling the waiting task lets the server exit mid-load.
+    """
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def mark_done():
+        if not done.done():
+            done.set_result(None)
+
+    def target():
+        try:
+            func()
+        finally:
+            try:
+                loop.call_soon_threadsafe(mark_done)
+            except RuntimeError:
+                pass  # Event loop already closed (server shut down mid-load)
+
+    threading.Thread(target=target, daemon=True).start()
+    await done
+
+
+async def refresh_data_periodically():
+    """Background task: initial load, then refresh data every hour.
+
+    The blocking MongoDB load runs on a daemon thread, so the event loop
+    keeps serving requests (and /api/stats reports loading) meanwhile.
+    """
+    await run_in_daemon_thread(load_eurotax_data)
     while True:
-        time.sleep(REFRESH_INTERVAL)
+        await asyncio.sleep(REFRESH_INTERVAL)
         print(f"\n[Auto-refresh] Refreshing Eurotax data from MongoDB...")
-        load_eurotax_data()
+        await run_in_daemon_thread(load_eurotax_data)
         print(f"[Auto-refresh] Complete\n")
 
 
@@ -110,6 +158,21 @@ def refresh_data_periodically():
 # X-CATALOG API CLIENT
 # ============================================================================
 
+# Shared session: keeps TLS connections to X-Catalog alive across calls (and
+# across the worker threads searches run in) instead of reconnecting per request.
+# Only connection errors are retried (twice, any method: the request never reached
+# the server, so even a mapping POST is safe to resend). Read errors/timeouts and
+# error statuses are not retried, so a slow call is never sent again.
+xcatalog_session = requests.Session()
+xcatalog_session.mount(
+    X_CATALOG_BASE_URL,
+    HTTPAdapter(
+        pool_connections=20, pool_maxsize=50,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.1),
+    ),
+)
+
+
 def fetch_infocar_from_xcatalog(provider_code: str, country: str = "it") -> Optional[Dict]:
     """Fetch Infocar vehicle data from X-Catalog API."""
     url = f"{X_CATALOG_BASE_URL}/trim/search"
@@ -129,7 +192,7 @@ def fetch_infocar_from_xcatalog(provider_code: str, country: str = "it") -> Opti
     }
 
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=30)
+        response = xcatalog_session.put(url, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
         data = response.json()
 
@@ -157,20 +220,27 @@ def fetch_existing_mapping(source_code: str, vehicle_type: str, country: str = "
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = xcatalog_session.get(url, params=params, headers=headers, timeout=15)
         response.raise_for_status()
         mappings = response.json()
 
         if not mappings or not isinstance(mappings, list):
             return None
 
-        # Filter to eurotax mappings and pick the most recent by createdAt
-        eurotax = [m for m in mappings if m.get('destProvider') == 'eurotax']
-        if not eurotax:
+        # Pick the most recent eurotax mapping in one pass: use id (MongoDB ObjectId,
+        # encodes timestamp) since API doesn't return createdAt. Strict > keeps the
+        # first of equal ids, as max() did.
+        latest = None
+        latest_id = ''
+        for m in mappings:
+            if m.get('destProvider') != 'eurotax':
+                continue
+            mapping_id = m.get('id') or ''
+            if latest is None or mapping_id > latest_id:
+                latest, latest_id = m, mapping_id
+        if latest is None:
             return None
 
-        # Pick most recent: use id (MongoDB ObjectId, encodes timestamp) since API doesn't return createdAt
-        latest = max(eurotax, key=lambda m: m.get('id') or '')
         return ExistingMapping(
             dest_code=str(latest.get('destCode', '')),
             dest_provider=latest.get('destProvider', ''),
@@ -212,36 +282,91 @@ def submit_mapping_to_xcatalog(
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = xcatalog_session.post(url, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
         return {"success": True, "data": response.json() if response.text else {}}
     except requests.exceptions.RequestException as e:
         return {"success": False, "error": str(e)}
 
 
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache for the app's X-Catalog trim lookups (the batch scripts keep their own).
+# Per worker process: with several uvicorn workers each keeps (and clears) its own.
+# Only found results are cached: the fetcher also returns None on request errors.
+# Existing mappings are not cached: they change whenever a mapping is submitted.
+infocar_cache = TTLCache(XCATALOG_CACHE_SIZE, XCATALOG_CACHE_TTL)
+
+
+def fetch_infocar_cached(provider_code: str, country: str = "it") -> Optional[Dict]:
+    """fetch_infocar_from_xcatalog with a short-lived cache for repeat searches."""
+    key = (provider_code, country)
+    rec = infocar_cache.get(key)
+    if rec is None:
+        rec = fetch_infocar_from_xcatalog(provider_code, country)
+        if rec is not None:
+            infocar_cache.set(key, rec)
+    return rec
+
+
 # ============================================================================
 # SPECS EXTRACTION
 # ============================================================================
 
+def epoch_ms_to_year(value) -> Optional[int]:
+    """Calendar year (UTC) of a sellableWindow timestamp in epoch milliseconds.
+
+    Accepts a plain number or an extended-JSON {'$numberLong': '...'} dict.
+    """
+    if isinstance(value, dict):
+        value = value.get('$numberLong')
+        if not value:
+            return None
+    elif not isinstance(value, (int, float)):
+        return None
+    try:
+        return (EPOCH + timedelta(milliseconds=int(value))).year
+    except OverflowError:
+        return None
+
+
 def extract_specs(rec: Dict) -> Dict:
     """Extract vehicle specs from a record."""
     sw = rec.get('sellableWindow', {})
-    begin = sw.get('begin', {})
-    end = sw.get('end', {})
-
-    if isinstance(begin, dict) and begin.get('$numberLong'):
-        begin_year = int(begin['$numberLong']) // 1000 // 86400 // 365 + 1970
-    elif isinstance(begin, (int, float)):
-        begin_year = int(begin) // 1000 // 86400 // 365 + 1970
-    else:
-        begin_year = None
-
-    if isinstance(end, dict) and end.get('$numberLong'):
-        end_year = int(end['$numberLong']) // 1000 // 86400 // 365 + 1970
-    elif isinstance(end, (int, float)):
-        end_year = int(end) // 1000 // 86400 // 365 + 1970
-    else:
-        end_year = None
+    begin_year = epoch_ms_to_year(sw.get('begin'))
+    end_year = epoch_ms_to_year(sw.get('end'))
 
     # Get price from nested structure if present
     price = rec.get('price')
@@ -283,6 +408,30 @@ def extract_specs(rec: Dict) -> Dict:
     }
 
 
+def precompute_specs(records: List[Dict]) -> None:
+    """Attach extracted specs, string natcode and candidate view to each Eurotax record.
+
+    Eurotax records are immutable between refreshes, so these are built once
+    per load instead of once per candidate per search. `_candidate` is the dict
+    passed to rank_candidates(). Must run after MatcherV4 indexing, which sets
+    `_vehicle_class`.
+    """
+    for rec in records:
+        specs = extract_specs(rec)
+        natcode = rec.get('providerCode', '')
+        if type(natcode) is not str:  # Usually already a string; skip the str() call
+            natcode = str(natcode)
+        rec['_specs'] = specs
+        rec['_natcode_str'] = natcode
+        rec['_candidate'] = {
+            'eurotax_code': rec.get('manufacturerCode', ''),
+            'natcode': natcode,
+            'eurotax_name': rec.get('name', ''),
+            'specs': specs,
+            'vehicle_class': rec.get('_vehicle_class'),
+        }
+
+
 # ============================================================================
 # FASTAPI APPLICATION
 # ============================================================================
@@ -290,11 +439,9 @@ def extract_specs(rec: Dict) -> Dict:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load data on startup when running via uvicorn (Docker/k8s)."""
-    load_thread = threading.Thread(target=load_eurotax_data, daemon=True)
-    load_thread.start()
-    refresh_thread = threading.Thread(target=refresh_data_periodically, daemon=True)
-    refresh_thread.start()
+    refresh_task = asyncio.create_task(refresh_data_periodically())
     yield
+    refresh_task.cancel()
 
 
 app = FastAPI(
@@ -369,8 +516,7 @@ async def stats():
     last_refresh_str = None
     next_refresh_in = None
     if last_refresh_time:
-        import datetime
-        last_refresh_str = datetime.datetime.fromtimestamp(last_refresh_time).isoformat()
+        last_refresh_str = datetime.fromtimestamp(last_refresh_time).isoformat()
         elapsed = time.time() - last_refresh_time
         next_refresh_in = max(0, REFRESH_INTERVAL - int(elapsed))
 
@@ -387,16 +533,20 @@ async def stats():
     }
 
 
+# Weight profiles are fixed at import time, so the response is serialized once
+PROFILES_JSON = orjson.dumps({
+    'profiles': {
+        name: {'weights': w, 'max_score': sum(w.values())}
+        for name, w in WEIGHT_PROFILES.items()
+    },
+    'default': DEFAULT_PROFILE
+})
+
+
 @app.get("/api/profiles")
 async def list_profiles():
     """Get available weight profiles."""
-    return {
-        'profiles': {
-            name: {'weights': w, 'max_score': sum(w.values())}
-            for name, w in WEIGHT_PROFILES.items()
-        },
-        'default': DEFAULT_PROFILE
-    }
+    return Response(PROFILES_JSON, media_type="application/json")
 
 
 @app.get("/api/eurotax/{natcode}")
@@ -414,10 +564,11 @@ async def get_eurotax_record(natcode: str):
         "natcode": natcode,
         "eurotax_code": rec.get('manufacturerCode', ''),
         "eurotax_name": rec.get('name', ''),
-        "specs": extract_specs(rec)
+        "specs": rec['_specs']
     }
 
 
+@lru_cache(maxsize=10_000)
 def invert_provider_code(code: str) -> Optional[str]:
     """Invert a 12-digit provider code by swapping first 6 and last 6 digits."""
     if not code or len(code) != 12 or not code.isdigit():
@@ -425,7 +576,12 @@ def invert_provider_code(code: str) -> Optional[str]:
     return code[6:] + code[:6]
 
 
-@app.get("/api/search")
+# Declared response model: FastAPI (>= 0.130, pinned in requirements.txt) serializes
+# the returned SearchResult straight to JSON bytes with pydantic-core instead of a
+# jsonable_encoder pass + stdlib json.
+# Results are built with model_construct (no validation): every field is set
+# here from values of known types, including the 10 nested candidate dicts.
+@app.get("/api/search", response_model=SearchResult)
 async def search(
     code: str = Query(..., description="Infocar provider code"),
     profile: str = Query(default=DEFAULT_PROFILE, description="Weight profile name")
@@ -440,22 +596,31 @@ async def search(
     weights = WEIGHT_PROFILES[profile]
     max_score = get_max_score(weights)
 
-    # Try original code first
-    infocar_rec = fetch_infocar_from_xcatalog(code)
+    # X-Catalog calls use blocking `requests` (shared with the batch scripts), so
+    # they run in worker threads to keep the event loop serving other requests.
+    # Original and inverted codes are looked up concurrently; the original wins if found
+    inverted = invert_provider_code(code)
+    if inverted:
+        original_rec, inverted_rec = await asyncio.gather(
+            asyncio.to_thread(fetch_infocar_cached, code),
+            asyncio.to_thread(fetch_infocar_cached, inverted),
+        )
+    else:
+        original_rec = await asyncio.to_thread(fetch_infocar_cached, code)
+        inverted_rec = None
+
+    infocar_rec = original_rec
     used_code = code
     was_inverted = False
 
-    # If not found, try inverted code
-    if not infocar_rec:
-        inverted = invert_provider_code(code)
-        if inverted:
-            infocar_rec = fetch_infocar_from_xcatalog(inverted)
-            if infocar_rec:
-                used_code = inverted
-                was_inverted = True
+    # If not found, use inverted code
+    if not infocar_rec and inverted_rec:
+        infocar_rec = inverted_rec
+        used_code = inverted
+        was_inverted = True
 
     if not infocar_rec:
-        return SearchResult(
+        return SearchResult.model_construct(
             found=False,
             error="Vehicle not found in X-Catalog. Check the provider code and VPN connection.",
             weight_profile=profile,
@@ -467,32 +632,26 @@ async def search(
     model = (infocar_rec.get('normalizedModel') or '').lower().strip()
     oem_code = infocar_rec.get('manufacturerCode', '')
     infocar_specs = extract_specs(infocar_rec)
+    infocar_trims = list(extract_trim_tokens(infocar_rec.get('name', '')))
 
     # Identify vehicle class
     body_type = normalize_body(infocar_rec.get('bodyType', ''))
     vehicle_class = identify_vehicle_class(brand, model, body_type)
 
-    # Get existing mapping via X-Catalog API (most recent)
+    # Get existing mapping via X-Catalog API (most recent). Submitted to the thread
+    # pool right away so the request overlaps with matching and ranking below
     vehicle_type = "lcv" if vehicle_class == "LCV" else "car"
-    existing_mapping = fetch_existing_mapping(used_code, vehicle_type)
+    existing_mapping_task = asyncio.get_running_loop().run_in_executor(
+        None, fetch_existing_mapping, used_code, vehicle_type
+    )
 
     # V4 MATCHING: Stage 1 - Make+Model candidates (no OEM gating)
     candidate_records = matcher.find_candidates(brand, model, vehicle_class)
 
-    candidates = []
-    if candidate_records:
-        for rec in candidate_records:
-            candidates.append({
-                'eurotax_code': rec.get('manufacturerCode', ''),
-                'natcode': str(rec.get('providerCode', '')),
-                'eurotax_name': rec.get('name', ''),
-                'specs': extract_specs(rec),
-                'vehicle_class': rec.get('_vehicle_class', vehicle_class)
-            })
+    candidates = [rec['_candidate'] for rec in candidate_records]
 
     if not candidates:
-        infocar_trims = list(extract_trim_tokens(infocar_rec.get('name', '')))
-        return SearchResult(
+        return SearchResult.model_construct(
             found=True,
             infocar_provider_code=used_code,
             infocar_code=oem_code,
@@ -504,7 +663,7 @@ async def search(
             candidate_count=0,
             candidates=[],
             stage2_decision="NO_CANDIDATES",
-            existing_mapping=existing_mapping,
+            existing_mapping=await existing_mapping_task,
             original_code=code,
             was_inverted=was_inverted,
             weight_profile=profile,
@@ -512,15 +671,12 @@ async def search(
         )
 
     # Stage 2: Score and rank candidates (OEM scored per-candidate)
-    ranked = rank_candidates(infocar_specs, candidates, oem_code, brand, weights=weights)
+    ranked = rank_candidates(infocar_specs, candidates, oem_code, brand, weights=weights, limit=10)
 
     top = ranked[0]
     decision = get_confidence(top['score'], max_score)
 
-    # Extract trims
-    infocar_trims = list(extract_trim_tokens(infocar_rec.get('name', '')))
-
-    return SearchResult(
+    return SearchResult.model_construct(
         found=True,
         infocar_provider_code=used_code,
         infocar_code=oem_code,
@@ -529,12 +685,12 @@ async def search(
         infocar_specs=infocar_specs,
         infocar_trims=infocar_trims,
         vehicle_class=vehicle_class,
-        candidate_count=len(ranked),
-        candidates=ranked[:10],  # Top 10
+        candidate_count=len(candidates),
+        candidates=ranked,  # Top 10
         stage2_decision=decision,
         stage2_confidence=top['score'] / max_score,
         stage2_recommended_natcode=top['natcode'],
-        existing_mapping=existing_mapping,
+        existing_mapping=await existing_mapping_task,
         original_code=code,
         was_inverted=was_inverted,
         weight_profile=profile,
@@ -547,7 +703,8 @@ async def create_mapping(request: MappingRequest):
     """Submit a new mapping to X-Catalog."""
     weights = WEIGHT_PROFILES.get(request.profile, WEIGHT_PROFILES[DEFAULT_PROFILE])
     max_score = get_max_score(weights)
-    result = submit_mapping_to_xcatalog(
+    result = await asyncio.to_thread(
+        submit_mapping_to_xcatalog,
         source_code=request.source_code,
         dest_code=request.dest_code,
         score=request.score,
@@ -560,6 +717,13 @@ async def create_mapping(request: MappingRequest):
     return result
 
 
+@app.post("/api/cache/clear")
+async def clear_cache():
+    """Drop all cached X-Catalog trim lookups (of the worker process serving this request)."""
+    infocar_cache.clear()
+    return {"success": True}
+
+
 # Mount static files
 static_dir = os.path.join(os.path.dirname(__file__), 'static')
 if os.path.exists(static_dir):
@@ -590,15 +754,30 @@ def open_browser(port):
     webbrowser.open(f"http://127.0.0.1:{port}")
 
 
+def parse_args():
+    """Parse command-line options."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Infocar-Eurotax Mapping Desktop App v4")
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=None,
+                        help='Port to listen on (default: first free port in 8000-8009)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Server processes; each loads its own copy of the Eurotax data '
+                             '(default: 1; the Docker image runs one per CPU, up to 4)')
+    return parser.parse_args()
+
+
 def main():
     """Run the desktop application."""
+    args = parse_args()
+
     print("=" * 60)
     print("Infocar-Eurotax Mapping Desktop App v4.0")
     print("OEM as Scoring Field - Make+Model Candidate Selection")
     print("=" * 60)
 
     # Find available port
-    port = find_available_port()
+    port = args.port or find_available_port()
     if port is None:
         print("\nERROR: Could not find an available port (8000-8009).")
         print("Please close other applications using these ports and try again.")
@@ -615,18 +794,28 @@ def main():
         print("  App will retry when loading data...")
 
     # Data loading and refresh are handled by FastAPI lifespan event
-    # (triggered automatically when uvicorn.run starts the app below)
+    # (triggered automatically when uvicorn.run starts the app below, in every worker)
 
-    # Open browser
-    browser_thread = threading.Thread(target=lambda: open_browser(port), daemon=True)
-    browser_thread.start()
+    # Open browser (once, not per worker)
+    if args.workers == 1:
+        browser_thread = threading.Thread(target=lambda: open_browser(port), daemon=True)
+        browser_thread.start()
 
-    print(f"\nStarting server at http://127.0.0.1:{port}")
+    print(f"\nStarting server at http://{args.host}:{port}")
+    if args.workers > 1:
+        print(f"Workers: {args.workers}")
     print(f"Data refresh interval: {REFRESH_INTERVAL // 60} minutes")
     print("Press Ctrl+C to stop\n")
 
-    # Run server
-    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+    # Run server (loop/http "auto" pick uvloop + httptools from uvicorn[standard]
+    # when available, and fall back to asyncio + h11 where they are not, e.g. Windows)
+    if args.workers > 1:
+        # Multiple processes need the app as an import string
+        uvicorn.run("main:app", app_dir=os.path.dirname(os.path.abspath(__file__)),
+                    host=args.host, port=port, workers=args.workers,
+                    log_level="warning", loop="auto", http="auto")
+    else:
+        uvicorn.run(app, host=args.host, port=port, log_level="warning", loop="auto", http="auto")
 
 
 if __name__ == "__main__":
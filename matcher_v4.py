@@ -20,9 +20,13 @@ BUG FIX from v3:
     All candidates come from make+model matching, and OEM match simply adds points.
 """
 
+import heapq
 import re
-from typing import Dict, List, Set, Tuple, Optional, Any
+import sys
+from functools import lru_cache
+from typing import Dict, List, FrozenSet, Set, Tuple, Optional, Any
 from collections import defaultdict
+from operator import itemgetter
 
 from normalizers import (
     normalize_fuel, normalize_body, normalize_transmission, normalize_traction,
@@ -189,27 +193,55 @@ TRIM_TOKENS = {
     '4matic', 'xdrive', '4x4', '4wd', 'traction',
 }
 
+# Token lookup structures for extract_trim_tokens (built once at import).
+# A single-word token matches r'\btoken\b' exactly when it is one of the name's
+# \w+ runs, so those reduce to a set intersection. Multi-part tokens ("gt line",
+# "r-line") keep their word-boundary regex, tried only when all parts are present.
+_WORD_RE = re.compile(r'\w+')
+_SINGLE_WORD_TRIM_TOKENS = frozenset(t for t in TRIM_TOKENS if _WORD_RE.fullmatch(t))
+_MULTI_PART_TRIM_TOKENS = [
+    (token, frozenset(_WORD_RE.findall(token)), re.compile(r'\b' + re.escape(token) + r'\b'))
+    for token in sorted(TRIM_TOKENS - _SINGLE_WORD_TRIM_TOKENS)
+]
 
-def extract_trim_tokens(name: str) -> Set[str]:
-    """Extract trim level tokens from vehicle name."""
+
+@lru_cache(maxsize=100_000)
+def extract_trim_tokens(name: str) -> FrozenSet[str]:
+    """
+    Extract trim level tokens from vehicle name.
+
+    Memoized on the name string; returns a frozenset so cached results
+    cannot be mutated by callers.
+    """
     if not name:
-        return set()
+        return frozenset()
 
     name_lower = name.lower()
-    found = set()
+    words = set(_WORD_RE.findall(name_lower))
+    found = words & _SINGLE_WORD_TRIM_TOKENS
 
-    for token in TRIM_TOKENS:
-        pattern = r'\b' + re.escape(token) + r'\b'
-        if re.search(pattern, name_lower):
+    for token, parts, pattern in _MULTI_PART_TRIM_TOKENS:
+        if parts <= words and pattern.search(name_lower):
             found.add(token)
 
-    return found
+    return frozenset(found)
 
 
 # =============================================================================
 # MATCHER CLASS
 # =============================================================================
 
+# Length of the model-name substrings indexed for candidate prefiltering.
+# If A contains B and len(B) >= MODEL_SHINGLE_SIZE, B's first shingle is one of
+# A's shingles, so the index never drops a model the containment test accepts.
+MODEL_SHINGLE_SIZE = 4
+
+
+def _model_shingles(text: str) -> Set[str]:
+    """All MODEL_SHINGLE_SIZE-character substrings of text."""
+    return {text[i:i + MODEL_SHINGLE_SIZE] for i in range(len(text) - MODEL_SHINGLE_SIZE + 1)}
+
+
 class MatcherV4:
     """
     Vehicle matcher v4 with:
@@ -224,19 +256,33 @@ class MatcherV4:
 
         # OEM code indexes (kept for scoring, not for candidate selection)
         self.exact_oem_index: Dict[str, List[Dict]] = defaultdict(list)
-        self.cleaned_oem_index: Dict[str, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+        self.cleaned_oem_index: Dict[str, Dict[str, List[Dict]]] = {}
 
-        # Make+Model index (primary candidate selection)
-        self.records_by_make: Dict[str, List[Dict]] = defaultdict(list)
+        # Make+class index (primary candidate selection): a query only walks
+        # records of its own vehicle class
+        self.records_by_make_class: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        # Same buckets grouped by lowercased model, as (position, record) pairs
+        self.records_by_model: Dict[Tuple[str, str], Dict[str, List[Tuple[int, Dict]]]] = {}
 
         # Build indexes
-        for rec in eurotax_records:
+        for position, rec in enumerate(eurotax_records):
             oem = (rec.get('manufacturerCode') or '').upper().strip()
-            make = (rec.get('normalizedMake') or '').upper().strip()
-            model = normalize_model((rec.get('normalizedModel') or '').lower().strip())
+            # Interned: the same few thousand makes/models repeat across all
+            # records, so every record shares one string object per value
+            make = sys.intern((rec.get('normalizedMake') or '').upper().strip())
+            model_lc = sys.intern((rec.get('normalizedModel') or '').lower().strip())
+            model = sys.intern(normalize_model(model_lc))
+
+            # Precompute cased/normalized make, model and body once per record
+            # (reused by every query)
+            body_type = normalize_body(rec.get('bodyType', ''))
+            rec['_make_uc'] = make
+            rec['_model_lc'] = model_lc
+            rec['_normalized_model'] = model
+            rec['_normalized_model_spaceless'] = sys.intern(model.replace(' ', ''))
+            rec['_body_norm'] = body_type
 
             # Determine vehicle class for this record
-            body_type = normalize_body(rec.get('bodyType', ''))
             rec['_vehicle_class'] = identify_vehicle_class(make, model, body_type)
 
             # OEM indexes (used during scoring to determine OEM match type)
@@ -245,16 +291,37 @@ class MatcherV4:
 
                 cleaned = clean_oem_code(oem, make)
                 if cleaned:
-                    self.cleaned_oem_index[make][cleaned.upper()].append(rec)
+                    self.cleaned_oem_index.setdefault(make, {}).setdefault(cleaned, []).append(rec)
 
-            # Make index for candidate selection
+            # Make+class index for candidate selection
             if make:
-                self.records_by_make[make].append(rec)
+                bucket = (make, rec['_vehicle_class'])
+                self.records_by_make_class[bucket].append(rec)
+                if model_lc:
+                    self.records_by_model.setdefault(bucket, {}).setdefault(model_lc, []).append((position, rec))
 
         # Convert to regular dicts
         self.exact_oem_index = dict(self.exact_oem_index)
-        self.cleaned_oem_index = {k: dict(v) for k, v in self.cleaned_oem_index.items()}
-        self.records_by_make = dict(self.records_by_make)
+        self.records_by_make_class = dict(self.records_by_make_class)
+
+        # Model shingle index per bucket: shingle -> distinct models having it in
+        # any of their raw/normalized/spaceless forms. Models with a form shorter
+        # than a shingle can be contained in anything, so they are always checked.
+        self.model_shingle_index: Dict[Tuple[str, str], Dict[str, Set[str]]] = {}
+        self.short_models: Dict[Tuple[str, str], List[str]] = {}
+        for bucket, models in self.records_by_model.items():
+            shingle_index: Dict[str, Set[str]] = defaultdict(set)
+            short_models = []
+            for model_lc, entries in models.items():
+                rec = entries[0][1]
+                forms = (model_lc, rec['_normalized_model'], rec['_normalized_model_spaceless'])
+                if min(map(len, forms)) < MODEL_SHINGLE_SIZE:
+                    short_models.append(model_lc)
+                    continue
+                for shingle in set().union(*map(_model_shingles, forms)):
+                    shingle_index[shingle].add(model_lc)
+            self.model_shingle_index[bucket] = dict(shingle_index)
+            self.short_models[bucket] = short_models
 
     def find_candidates(
         self,
@@ -282,39 +349,48 @@ class MatcherV4:
         if not model:
             return []
 
-        same_make = self.records_by_make.get(brand, [])
-        if not same_make:
+        bucket = (brand, vehicle_class)
+        models = self.records_by_model.get(bucket)
+        if not models:
             return []
 
         # Normalize source model (expand abbreviations, remove year suffixes)
         source_model_norm = normalize_model(model)
         source_spaceless = source_model_norm.replace(' ', '')
 
-        candidates = []
-        for rec in same_make:
-            # Check vehicle class
-            if rec.get('_vehicle_class') != vehicle_class:
-                continue
-
-            eurotax_model = (rec.get('normalizedModel') or '').lower().strip()
-            if not eurotax_model:
-                continue
-
-            # Normalize target model
-            target_model_norm = normalize_model(eurotax_model)
+        # Prefilter: only models sharing a shingle with the source (plus short
+        # models) can pass containment. A short source form can be contained in
+        # any model, so then every model of the bucket is checked.
+        source_forms = (model, source_model_norm, source_spaceless)
+        if min(map(len, source_forms)) < MODEL_SHINGLE_SIZE:
+            possible_models = models.keys()
+        else:
+            shingle_index = self.model_shingle_index[bucket]
+            possible_models = set(self.short_models[bucket])
+            for shingle in set().union(*map(_model_shingles, source_forms)):
+                possible_models.update(shingle_index.get(shingle, ()))
+
+        matched = []
+        for eurotax_model in possible_models:
+            entries = models[eurotax_model]
+            # Target model (and its spaceless variant) normalized once at index time
+            target = entries[0][1]
+            target_model_norm = target['_normalized_model']
+            target_spaceless = target['_normalized_model_spaceless']
 
             # Model containment (either direction) using normalized names
             # Spaceless variants handle inconsistent spacing (e.g., "500 x" vs "500x")
-            target_spaceless = target_model_norm.replace(' ', '')
             if (source_model_norm in target_model_norm or
-                target_model_norm in source_model_norm or
-                model in eurotax_model or
-                eurotax_model in model or
-                source_spaceless in target_spaceless or
-                target_spaceless in source_spaceless):
-                candidates.append(rec)
+                    target_model_norm in source_model_norm or
+                    model in eurotax_model or
+                    eurotax_model in model or
+                    source_spaceless in target_spaceless or
+                    target_spaceless in source_spaceless):
+                matched.extend(entries)
 
-        return candidates
+        # Back to load order (ties in ranking keep candidate order)
+        matched.sort(key=itemgetter(0))
+        return [rec for _, rec in matched]
 
 
 # =============================================================================
@@ -376,10 +452,12 @@ def score_cc(source_cc: Optional[int], target_cc: Optional[int], weights=None) -
 
 def score_fuel(source_fuel: str, target_fuel: str, weights=None) -> int:
     """Score fuel type match using normalized values."""
-    w = (weights or WEIGHTS)['fuel']
-    norm_source = normalize_fuel(source_fuel)
-    norm_target = normalize_fuel(target_fuel)
+    return score_fuel_normalized(normalize_fuel(source_fuel), normalize_fuel(target_fuel), weights)
 
+
+def score_fuel_normalized(norm_source: str, norm_target: str, weights=None) -> int:
+    """score_fuel for values already passed through normalize_fuel."""
+    w = (weights or WEIGHTS)['fuel']
     if not norm_source or not norm_target:
         return 0
     if norm_source == norm_target:
@@ -394,10 +472,12 @@ def score_fuel(source_fuel: str, target_fuel: str, weights=None) -> int:
 
 def score_body(source_body: str, target_body: str, weights=None) -> int:
     """Score body type match using normalized values."""
-    w = (weights or WEIGHTS)['body']
-    norm_source = normalize_body(source_body)
-    norm_target = normalize_body(target_body)
+    return score_body_normalized(normalize_body(source_body), normalize_body(target_body), weights)
 
+
+def score_body_normalized(norm_source: str, norm_target: str, weights=None) -> int:
+    """score_body for values already passed through normalize_body."""
+    w = (weights or WEIGHTS)['body']
     if not norm_source or not norm_target:
         return 0
     if norm_source == norm_target:
@@ -408,17 +488,22 @@ def score_body(source_body: str, target_body: str, weights=None) -> int:
 
 def score_transmission(source_trans: str, target_trans: str, source_fuel: str, weights=None) -> int:
     """Score transmission match (lenient for EVs)."""
-    w = (weights or WEIGHTS)['transmission']
-    norm_source = normalize_transmission(source_trans)
-    norm_target = normalize_transmission(target_trans)
+    return score_transmission_normalized(
+        normalize_transmission(source_trans), normalize_transmission(target_trans),
+        normalize_fuel(source_fuel), weights
+    )
+
 
+def score_transmission_normalized(norm_source: str, norm_target: str, source_fuel_norm: str, weights=None) -> int:
+    """score_transmission for values already passed through the normalizers."""
+    w = (weights or WEIGHTS)['transmission']
     if not norm_source or not norm_target:
         return 0
     if norm_source == norm_target:
         return w
 
     # EVs often have different transmission encoding
-    if normalize_fuel(source_fuel) == 'ELECTRIC':
+    if source_fuel_norm == 'ELECTRIC':
         return int(w * 0.5)
 
     return 0
@@ -426,10 +511,12 @@ def score_transmission(source_trans: str, target_trans: str, source_fuel: str, w
 
 def score_traction(source_traction: str, target_traction: str, weights=None) -> int:
     """Score traction match."""
-    w = (weights or WEIGHTS)['traction']
-    norm_source = normalize_traction(source_traction)
-    norm_target = normalize_traction(target_traction)
+    return score_traction_normalized(normalize_traction(source_traction), normalize_traction(target_traction), weights)
+
 
+def score_traction_normalized(norm_source: str, norm_target: str, weights=None) -> int:
+    """score_traction for values already passed through normalize_traction."""
+    w = (weights or WEIGHTS)['traction']
     if not norm_source or not norm_target:
         return 0
     if norm_source == norm_target:
@@ -530,13 +617,14 @@ def score_trim(source_name: str, target_name: str, weights=None) -> Tuple[int, S
     source_trims = extract_trim_tokens(source_name)
     target_trims = extract_trim_tokens(target_name)
 
+    # Most names carry no trim keyword at all: skip the set algebra
+    if not source_trims and not target_trims:
+        return 0, set(), set(), set()
+
     matched = source_trims & target_trims
     source_only = source_trims - target_trims
     target_only = target_trims - source_trims
 
-    if not source_trims and not target_trims:
-        return 0, set(), set(), set()
-
     if not source_trims or not target_trims:
         return 0, matched, source_only, target_only
 
@@ -547,20 +635,30 @@ def score_trim(source_name: str, target_name: str, weights=None) -> Tuple[int, S
     return 0, matched, source_only, target_only
 
 
+# Tokens ignored by name similarity
+_NAME_NOISE_TOKENS = frozenset({'cv', 'hp', 'kw', 'auto', 'aut', 'man', 'the', 'and', 'di', 'da'})
+
+
+@lru_cache(maxsize=100_000)
+def name_tokens(name: str) -> FrozenSet[str]:
+    """
+    Lowercased word tokens of a vehicle name, without noise words.
+
+    Memoized like extract_trim_tokens: the source name is tokenized once per
+    search instead of once per candidate, and Eurotax names once per load.
+    """
+    # \w+ runs, same as r'\b\w+\b'; noise words dropped as we go
+    return frozenset(t for t in _WORD_RE.findall(name.lower()) if t not in _NAME_NOISE_TOKENS)
+
+
 def score_name_similarity(source_name: str, target_name: str, weights=None) -> int:
     """Score overall name token similarity."""
     w = (weights or WEIGHTS)['name']
     if not source_name or not target_name:
         return 0
 
-    # Tokenize
-    source_tokens = set(re.findall(r'\b\w+\b', source_name.lower()))
-    target_tokens = set(re.findall(r'\b\w+\b', target_name.lower()))
-
-    # Remove common noise words
-    noise = {'cv', 'hp', 'kw', 'auto', 'aut', 'man', 'the', 'and', 'di', 'da'}
-    source_tokens -= noise
-    target_tokens -= noise
+    source_tokens = name_tokens(source_name)
+    target_tokens = name_tokens(target_name)
 
     if not source_tokens or not target_tokens:
         return 0
@@ -653,7 +751,7 @@ def score_oem(
     target_cleaned = clean_oem_code(target_upper, brand)
 
     if source_cleaned and target_cleaned:
-        if source_cleaned.upper() == target_cleaned.upper():
+        if source_cleaned == target_cleaned:
             return int(w * 0.5), 'CLEANED'
 
     return 0, 'NONE'
@@ -663,14 +761,23 @@ def score_oem(
 # MAIN SCORING FUNCTION
 # =============================================================================
 
+def _normalized_spec(specs: Dict[str, Any], key: str, norm_key: str, normalizer) -> str:
+    """specs[norm_key] when precomputed (extract_specs), else normalizer(specs[key])."""
+    norm = specs.get(norm_key)
+    if norm is None:
+        return normalizer(specs.get(key, ''))
+    return norm
+
+
 def score_candidate(
     source_specs: Dict[str, Any],
     target_specs: Dict[str, Any],
     source_oem: str,
     target_oem: str,
     brand: str,
-    weights=None
-) -> Tuple[int, Dict[str, Any]]:
+    weights=None,
+    min_score: Optional[int] = None
+) -> Optional[Tuple[int, Dict[str, Any]]]:
     """
     Score a single candidate.
 
@@ -681,9 +788,11 @@ def score_candidate(
         target_oem: Target candidate OEM code
         brand: Brand name for OEM cleaning
         weights: Optional weights dict (defaults to WEIGHTS)
+        min_score: Optional bound; scoring stops early (returning None) once
+            the total can no longer exceed it
 
     Returns:
-        Tuple of (total_score, breakdown_dict)
+        Tuple of (total_score, breakdown_dict), or None if cut off by min_score
     """
     w = weights or WEIGHTS
     breakdown = {}
@@ -709,32 +818,36 @@ def score_candidate(
         weights=w
     )
 
+    # Categorical fields use the normalized values extract_specs stores in the
+    # specs (Eurotax specs are built once per load), normalizing only if absent
+    source_fuel = _normalized_spec(source_specs, 'fuel', 'fuel_norm', normalize_fuel)
+
     # Fuel
-    breakdown['fuel'] = score_fuel(
-        source_specs.get('fuel', ''),
-        target_specs.get('fuel', ''),
+    breakdown['fuel'] = score_fuel_normalized(
+        source_fuel,
+        _normalized_spec(target_specs, 'fuel', 'fuel_norm', normalize_fuel),
         weights=w
     )
 
     # Body
-    breakdown['body'] = score_body(
-        source_specs.get('body', ''),
-        target_specs.get('body', ''),
+    breakdown['body'] = score_body_normalized(
+        _normalized_spec(source_specs, 'body', 'body_norm', normalize_body),
+        _normalized_spec(target_specs, 'body', 'body_norm', normalize_body),
         weights=w
     )
 
     # Transmission
-    breakdown['transmission'] = score_transmission(
-        source_specs.get('gear_type', ''),
-        target_specs.get('gear_type', ''),
-        source_specs.get('fuel', ''),
+    breakdown['transmission'] = score_transmission_normalized(
+        _normalized_spec(source_specs, 'gear_type', 'gear_type_norm', normalize_transmission),
+        _normalized_spec(target_specs, 'gear_type', 'gear_type_norm', normalize_transmission),
+        source_fuel,
         weights=w
     )
 
     # Traction
-    breakdown['traction'] = score_traction(
-        source_specs.get('traction', ''),
-        target_specs.get('traction', ''),
+    breakdown['traction'] = score_traction_normalized(
+        _normalized_spec(source_specs, 'traction', 'traction_norm', normalize_traction),
+        _normalized_spec(target_specs, 'traction', 'traction_norm', normalize_traction),
         weights=w
     )
 
@@ -773,6 +886,16 @@ def score_candidate(
         weights=w
     )
 
+    # Running total of the factors so far (the breakdown has no '_' keys yet)
+    total_score = sum(breakdown.values())
+
+    # Early exit before the string-heavy factors: each remaining factor scores at
+    # most its weight, so stop if even full marks could not exceed min_score
+    if min_score is not None:
+        remaining = w['trim'] + w['name'] + w['model'] + w['sellable'] + w['oem']
+        if total_score + remaining <= min_score:
+            return None
+
     # Trim
     trim_score, matched_trims, source_only, target_only = score_trim(
         source_specs.get('name', ''),
@@ -812,8 +935,8 @@ def score_candidate(
     breakdown['oem'] = oem_score
     breakdown['_oem_match_type'] = oem_match_type
 
-    # Calculate total
-    total_score = sum(v for k, v in breakdown.items() if not k.startswith('_'))
+    # Calculate total (the '_' entries are UI details, not scores)
+    total_score += trim_score + breakdown['name'] + breakdown['model'] + breakdown['sellable'] + oem_score
 
     return total_score, breakdown
 
@@ -823,7 +946,8 @@ def rank_candidates(
     candidates: List[Dict[str, Any]],
     source_oem: str,
     brand: str,
-    weights=None
+    weights=None,
+    limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Score and rank all candidates.
@@ -834,36 +958,59 @@ def rank_candidates(
         source_oem: Source vehicle OEM code (for per-candidate OEM scoring)
         brand: Brand name (for OEM cleaning)
         weights: Optional weights dict (defaults to WEIGHTS)
+        limit: Optional number of top candidates to return. Candidates that
+            provably cannot make the top `limit` are not fully scored.
 
     Returns:
-        List of candidates sorted by score (highest first)
+        List of candidates sorted by score (highest first), ties in input order
     """
     scored = []
+    # Scores of the best `limit` candidates so far (min-heap). A later candidate
+    # only makes the final top `limit` by scoring strictly above the smallest
+    # of them, since ties keep input order.
+    top_scores: List[int] = []
 
     for cand in candidates:
         target_specs = cand.get('specs', {})
         target_oem = cand.get('eurotax_code', '')
 
-        score, breakdown = score_candidate(
+        result = score_candidate(
             source_specs, target_specs,
             source_oem, target_oem, brand,
-            weights=weights
+            weights=weights,
+            min_score=top_scores[0] if limit and len(top_scores) == limit else None
         )
-
-        scored_cand = cand.copy()
-        scored_cand['score'] = score
-        scored_cand['breakdown'] = breakdown
-        scored_cand['oem_match_type'] = breakdown.get('_oem_match_type', 'NONE')
-        # Extract trim fields for UI
-        scored_cand['trim_matched'] = breakdown.get('_trim_matched', [])
-        scored_cand['trim_source_only'] = breakdown.get('_trim_source_only', [])
-        scored_cand['trim_target_only'] = breakdown.get('_trim_target_only', [])
-        scored.append(scored_cand)
-
-    # Sort by score descending
-    scored.sort(key=lambda x: -x['score'])
-
-    return scored
+        if result is None:
+            continue
+        score, breakdown = result
+        if limit:
+            if len(top_scores) < limit:
+                heapq.heappush(top_scores, score)
+            elif score > top_scores[0]:
+                heapq.heapreplace(top_scores, score)
+
+        scored.append((score, breakdown, cand))
+
+    # Sort by score descending (both are stable: ties keep input order)
+    if limit:
+        scored = heapq.nlargest(limit, scored, key=itemgetter(0))
+    else:
+        scored.sort(key=itemgetter(0), reverse=True)
+
+    # Output dicts are only built for the candidates that are returned
+    return [
+        {
+            **cand,
+            'score': score,
+            'breakdown': breakdown,
+            'oem_match_type': breakdown.get('_oem_match_type', 'NONE'),
+            # Extract trim fields for UI
+            'trim_matched': breakdown.get('_trim_matched', []),
+            'trim_source_only': breakdown.get('_trim_source_only', []),
+            'trim_target_only': breakdown.get('_trim_target_only', []),
+        }
+        for score, breakdown, cand in scored
+    ]
 
 
 def get_confidence(score: int, max_score: int = 157) -> str:
@@ -7,18 +7,24 @@ All comparisons in v4 use normalized values for consistency.
 """
 
 import re
-from typing import Optional
+import string
+from functools import lru_cache
+from typing import Callable, Dict, Optional
 
 
 # =============================================================================
 # FUEL TYPE NORMALIZATION
 # =============================================================================
 
+@lru_cache(maxsize=4096)
 def normalize_fuel(fuel: Optional[str]) -> str:
     """
     Normalize fuel type to standard values:
     DIESEL, PETROL, HYBRID_PETROL, HYBRID_DIESEL, ELECTRIC, LPG, CNG
 
+    Memoized: like the other attribute normalizers, it sees a few dozen
+    distinct raw values across the whole corpus.
+
     Args:
         fuel: Raw fuel type string
 
@@ -69,6 +75,11 @@ def normalize_fuel(fuel: Optional[str]) -> str:
 # BODY TYPE NORMALIZATION
 # =============================================================================
 
+# Door count suffixes like "3 porte", "5 porte"
+_DOOR_SUFFIX_RE = re.compile(r'\s*\d+\s*port[ei]')
+
+
+@lru_cache(maxsize=4096)
 def normalize_body(body: Optional[str]) -> str:
     """
     Normalize body type to standard values.
@@ -89,7 +100,7 @@ def normalize_body(body: Optional[str]) -> str:
 
     body_lower = body.lower().strip()
     # Remove door count suffixes like "3 porte", "5 porte"
-    body_lower = re.sub(r'\s*\d+\s*port[ei]', '', body_lower).strip()
+    body_lower = _DOOR_SUFFIX_RE.sub('', body_lower).strip()
     # Remove trailing qualifiers like "Outdoor"
     body_lower = body_lower.strip()
 
@@ -159,6 +170,12 @@ def normalize_body(body: Optional[str]) -> str:
 # TRANSMISSION NORMALIZATION
 # =============================================================================
 
+# Keyword alternations: one C-level scan instead of an any() over `in` checks
+_TRANS_AUTOMATIC_RE = re.compile(r'automatic|auto|dsg|dct|robotizzato|sequenziale')
+_TRANS_MANUAL_RE = re.compile(r'manual|manuale|meccanico')
+
+
+@lru_cache(maxsize=4096)
 def normalize_transmission(trans: Optional[str]) -> str:
     """
     Normalize transmission type to standard values:
@@ -175,9 +192,9 @@ def normalize_transmission(trans: Optional[str]) -> str:
 
     trans_lower = trans.lower().strip()
 
-    if any(kw in trans_lower for kw in ('automatic', 'auto', 'dsg', 'dct', 'robotizzato', 'sequenziale')):
+    if _TRANS_AUTOMATIC_RE.search(trans_lower):
         return 'AUTOMATIC'
-    if any(kw in trans_lower for kw in ('manual', 'manuale', 'meccanico')):
+    if _TRANS_MANUAL_RE.search(trans_lower):
         return 'MANUAL'
     if 'cvt' in trans_lower:
         return 'CVT'
@@ -189,6 +206,12 @@ def normalize_transmission(trans: Optional[str]) -> str:
 # TRACTION NORMALIZATION
 # =============================================================================
 
+_TRACTION_FWD_RE = re.compile(r'anteriore|front|fwd')
+_TRACTION_RWD_RE = re.compile(r'posteriore|rear|rwd')
+_TRACTION_AWD_RE = re.compile(r'integrale|all-wheel|awd|4x4|4wd')
+
+
+@lru_cache(maxsize=4096)
 def normalize_traction(traction: Optional[str]) -> str:
     """
     Normalize traction type to standard values:
@@ -205,11 +228,11 @@ def normalize_traction(traction: Optional[str]) -> str:
 
     traction_lower = traction.lower().strip()
 
-    if any(kw in traction_lower for kw in ('anteriore', 'front', 'fwd')):
+    if _TRACTION_FWD_RE.search(traction_lower):
         return 'FWD'
-    if any(kw in traction_lower for kw in ('posteriore', 'rear', 'rwd')):
+    if _TRACTION_RWD_RE.search(traction_lower):
         return 'RWD'
-    if any(kw in traction_lower for kw in ('integrale', 'all-wheel', 'awd', '4x4', '4wd')):
+    if _TRACTION_AWD_RE.search(traction_lower):
         return 'AWD'
 
     return ''
@@ -219,7 +242,8 @@ def normalize_traction(traction: Optional[str]) -> str:
 # MODEL NAME NORMALIZATION
 # =============================================================================
 
-# Model abbreviations and synonyms (lowercase)
+# Model abbreviations and synonyms (lowercase). Short codes that are already
+# canonical (BMW x1..x7, Mercedes cla/glc/eqs, ...) pass through unchanged.
 MODEL_EXPANSIONS = {
     # Land Rover abbreviations
     'rr': 'range rover',
@@ -227,27 +251,6 @@ MODEL_EXPANSIONS = {
     'rre': 'range rover evoque',
     'rrs': 'range rover sport',
     'rrv': 'range rover velar',
-    # BMW abbreviations
-    'x1': 'x1',
-    'x2': 'x2',
-    'x3': 'x3',
-    'x4': 'x4',
-    'x5': 'x5',
-    'x6': 'x6',
-    'x7': 'x7',
-    # Mercedes abbreviations
-    'cla': 'cla',
-    'cls': 'cls',
-    'gla': 'gla',
-    'glb': 'glb',
-    'glc': 'glc',
-    'gle': 'gle',
-    'gls': 'gls',
-    'eqa': 'eqa',
-    'eqb': 'eqb',
-    'eqc': 'eqc',
-    'eqe': 'eqe',
-    'eqs': 'eqs',
     # Alfa Romeo
     'ar': 'alfa romeo',
     # Volkswagen
@@ -255,10 +258,22 @@ MODEL_EXPANSIONS = {
 }
 
 
+# Trailing generation numeral (optionally followed by a year), together with
+# a year right before it, or else just a trailing year
+_MODEL_SUFFIX_RE = re.compile(
+    r'\s+(?:\d{4}\s+)?(?:i{1,3}|iv|v|vi|vii|viii)(?:\s+\d{4})?$|\s+\d{4}$'
+)
+_DS_MODEL_RE = re.compile(r'^ds\s+(\d)\b')
+
+
+@lru_cache(maxsize=100_000)
 def normalize_model(model: Optional[str]) -> str:
     """
     Normalize model name by expanding common abbreviations.
 
+    Memoized: the model vocabulary is small and the same names are
+    normalized over and over during candidate selection.
+
     Args:
         model: Raw model name
 
@@ -272,12 +287,11 @@ def normalize_model(model: Optional[str]) -> str:
 
     # Remove year suffixes like "ii 2024", "v 2020", "iii", "iv", etc.
     # But keep the base model name
-    model_clean = re.sub(r'\s+(i{1,3}|iv|v|vi|vii|viii)(\s+\d{4})?$', '', model_lower)
-    model_clean = re.sub(r'\s+\d{4}$', '', model_clean)  # Remove trailing year
+    model_clean = _MODEL_SUFFIX_RE.sub('', model_lower, count=1)
 
     # DS models: collapse "ds N" -> "dsN" (Infocar uses space, Eurotax doesn't)
-    model_clean = re.sub(r'^ds\s+(\d)$', r'ds\1', model_clean)
-    model_clean = re.sub(r'^ds\s+(\d)\b', r'ds\1', model_clean)
+    if model_clean.startswith('ds'):
+        model_clean = _DS_MODEL_RE.sub(r'ds\1', model_clean, count=1)
 
     # Expand abbreviations
     words = model_clean.split()
@@ -295,113 +309,185 @@ def normalize_model(model: Optional[str]) -> str:
 # OEM CODE CLEANING (Brand-Specific)
 # =============================================================================
 
+_DACIA_PREFIX_RE = re.compile(r'^[A-Z0-9]{2,3}\d?([A-Z].+)$')
+_MERCEDES_DL_RE = re.compile(r'^(.+DL\d)')
+_CUPRA_OPTION_RE = re.compile(r'^(.+?)(P[0-9X][0-9A-Z]|PF[0-9]).*$')
+_MG_SUFFIX_RE = re.compile(r'^(.+?)(BJAY|WSB|JAY|JAB|LMD|LJAY|SSA|YGM|RSJ)$')
+
+# Known option suffixes (all 3 chars), checked with one str.endswith call
+_SKODA_SUFFIXES = ('RAA', 'WI1')
+_AUDI_SUFFIXES = ('YEG', 'YEA', 'WK4')
+_MINI_SUFFIXES = ('7EL', 'ZKQ', 'ZEA', 'ZEB', 'ZBI', 'ZBU', 'ZBX')
+
+_OEM_LETTERS = frozenset(string.ascii_uppercase)
+_OEM_CODE_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+
+def _has_dash_suffix(oem: str, length: int) -> bool:
+    """Check whether the code ends with '-' followed by `length` of [A-Z0-9]."""
+    return (
+        len(oem) > length
+        and oem[-length - 1] == '-'
+        and _OEM_CODE_CHARS.issuperset(oem[-length:])
+    )
+
+
+def _clean_renault(oem: str) -> Optional[str]:
+    """Renault: Remove 2-3 char prefix before digits."""
+    if len(oem) >= 4 and oem[0] in _OEM_LETTERS and oem[1] in _OEM_LETTERS:
+        # Pattern: XX(X)digit... -> remove prefix
+        digit_pos = 3 if oem[2] in _OEM_LETTERS else 2
+        if oem[digit_pos].isdecimal() and len(oem) - digit_pos > 5:
+            return oem[digit_pos + 1:]
+        # Alternative pattern: XX + two digits
+        if oem[2].isdecimal() and oem[3].isdecimal() and len(oem) >= 9:
+            return oem[4:]
+    # Generic: drop first 3 chars if long enough
+    if len(oem) > 6:
+        return oem[3:]
+    return None
+
+
+def _clean_dacia(oem: str) -> Optional[str]:
+    """Dacia: Similar to Renault."""
+    match = _DACIA_PREFIX_RE.match(oem)
+    if match and len(match.group(1)) >= 5:
+        return match.group(1)
+    if len(oem) > 8:
+        return oem[3:]
+    return None
+
+
+def _clean_volkswagen(oem: str) -> Optional[str]:
+    """Volkswagen: Remove -XXX suffix."""
+    if _has_dash_suffix(oem, 3):
+        return oem[:-4]  # Remove "-XXX" (4 chars)
+    return None
+
+
+def _clean_skoda(oem: str) -> Optional[str]:
+    """Skoda: Remove -XXX suffix (similar to VW)."""
+    if oem.endswith(_SKODA_SUFFIXES):
+        return oem[:-3]
+    return None
+
+
+def _clean_mercedes(oem: str) -> Optional[str]:
+    """Mercedes: Remove -XX suffix."""
+    match = _MERCEDES_DL_RE.match(oem)
+    if match:
+        return match.group(1)
+    if _has_dash_suffix(oem, 2):
+        return oem[:-3]  # Remove "-XX" (3 chars)
+    return None
+
+
+def _clean_audi(oem: str) -> Optional[str]:
+    """Audi: Remove -X, -XX, -XXX suffixes."""
+    if oem.endswith(_AUDI_SUFFIXES):
+        return oem[:-3]
+    # Generic suffix removal
+    for length in (1, 2, 3):
+        if len(oem) > length + 1 and _has_dash_suffix(oem, length):
+            return oem[:-length - 1]
+    return None
+
+
+def _clean_opel(oem: str) -> Optional[str]:
+    """Opel: Remove trailing single letter."""
+    if len(oem) >= 7 and oem[-1] in _OEM_LETTERS and oem[-2] not in _OEM_LETTERS:
+        return oem[:-1]
+    # Alternative: remove last 2 chars
+    if len(oem) >= 7:
+        return oem[:-2]
+    return None
+
+
+def _clean_mini(oem: str) -> Optional[str]:
+    """Mini: Remove -XX suffix."""
+    if oem.endswith(_MINI_SUFFIXES):
+        return oem[:-3]
+    return None
+
+
+def _clean_psa(oem: str) -> Optional[str]:
+    """Peugeot/Citroen/DS."""
+    if len(oem) >= 8:
+        return oem[:-2]
+    return None
+
+
+def _clean_kia_hyundai(oem: str) -> Optional[str]:
+    """KIA/Hyundai."""
+    if len(oem) >= 8:
+        return oem[:-3]
+    return None
+
+
+def _clean_mazda(oem: str) -> Optional[str]:
+    """Mazda."""
+    if len(oem) >= 5:
+        return oem[:-1]
+    return None
+
+
+def _clean_cupra(oem: str) -> Optional[str]:
+    """Cupra."""
+    match = _CUPRA_OPTION_RE.match(oem)
+    if match and len(match.group(1)) >= 5:
+        return match.group(1)
+    return None
+
+
+def _clean_mg(oem: str) -> Optional[str]:
+    """MG."""
+    match = _MG_SUFFIX_RE.match(oem)
+    if match and len(match.group(1)) >= 8:
+        return match.group(1)
+    return None
+
+
+# Uppercased brand -> cleaner for its (uppercased, stripped) OEM codes
+OEM_CLEANERS: Dict[str, Callable[[str], Optional[str]]] = {
+    'RENAULT': _clean_renault,
+    'DACIA': _clean_dacia,
+    'VOLKSWAGEN': _clean_volkswagen,
+    'SKODA': _clean_skoda,
+    'MERCEDES': _clean_mercedes,
+    'MERCEDES-BENZ': _clean_mercedes,
+    'AUDI': _clean_audi,
+    'OPEL': _clean_opel,
+    'MINI': _clean_mini,
+    'PEUGEOT': _clean_psa,
+    'CITROEN': _clean_psa,
+    'DS': _clean_psa,
+    'KIA': _clean_kia_hyundai,
+    'HYUNDAI': _clean_kia_hyundai,
+    'MAZDA': _clean_mazda,
+    'CUPRA': _clean_cupra,
+    'MG': _clean_mg,
+}
+
+
+@lru_cache(maxsize=100_000)
 def clean_oem_code(oem: str, brand: str) -> Optional[str]:
     """
     Apply brand-specific OEM code cleaning transformations.
 
+    Memoized on (oem, brand): each code is cleaned at index time and again
+    when scored against every search that returns it.
+
     Args:
         oem: Raw OEM code (will be uppercased)
         brand: Brand name (case-insensitive)
 
     Returns:
-        Cleaned OEM code, or None if no transformation applies
+        Cleaned OEM code (uppercase), or None if no transformation applies
     """
     if not oem:
         return None
 
-    oem = oem.upper().strip()
-    brand = (brand or '').upper().strip()
-
-    # Renault: Remove 2-3 char prefix before digits
-    if brand == 'RENAULT':
-        # Pattern: XX(X)digit... -> remove prefix
-        match = re.match(r'^[A-Z]{2,3}\d(.+)$', oem)
-        if match and len(match.group(1)) >= 5:
-            return match.group(1)
-        # Alternative pattern
-        match = re.match(r'^[A-Z]{2}\d{2}(.+)$', oem)
-        if match and len(match.group(1)) >= 5:
-            return match.group(1)
-        # Generic: drop first 3 chars if long enough
-        if len(oem) > 6:
-            return oem[3:]
-
-    # Dacia: Similar to Renault
-    elif brand == 'DACIA':
-        match = re.match(r'^[A-Z0-9]{2,3}\d?([A-Z].+)$', oem)
-        if match and len(match.group(1)) >= 5:
-            return match.group(1)
-        if len(oem) > 8:
-            return oem[3:]
-
-    # Volkswagen: Remove -XXX suffix
-    elif brand == 'VOLKSWAGEN':
-        if re.search(r'-[A-Z0-9]{3}$', oem):
-            return oem[:-4]  # Remove "-XXX" (4 chars)
-
-    # Skoda: Remove -XXX suffix (similar to VW)
-    elif brand == 'SKODA':
-        for suffix in ['RAA', 'WI1']:
-            if oem.endswith(suffix):
-                return oem[:-len(suffix)]
-
-    # Mercedes: Remove -XX suffix
-    elif brand in ('MERCEDES', 'MERCEDES-BENZ'):
-        match = re.match(r'^(.+DL\d)', oem)
-        if match:
-            return match.group(1)
-        if re.search(r'-[A-Z0-9]{2}$', oem):
-            return oem[:-3]  # Remove "-XX" (3 chars)
-
-    # Audi: Remove -X, -XX, -XXX suffixes
-    elif brand == 'AUDI':
-        for suffix in ['YEG', 'YEA', 'WK4']:
-            if oem.endswith(suffix):
-                return oem[:-len(suffix)]
-        # Generic suffix removal
-        match = re.match(r'^(.+)-[A-Z0-9]{1,3}$', oem)
-        if match:
-            return match.group(1)
-
-    # Opel: Remove trailing single letter
-    elif brand == 'OPEL':
-        if len(oem) >= 7 and oem[-1].isalpha() and not oem[-2].isalpha():
-            return oem[:-1]
-        # Alternative: remove last 2 chars
-        if len(oem) >= 7:
-            return oem[:-2]
-
-    # Mini: Remove -XX suffix
-    elif brand == 'MINI':
-        for suffix in ['7EL', 'ZKQ', 'ZEA', 'ZEB', 'ZBI', 'ZBU', 'ZBX']:
-            if oem.endswith(suffix):
-                return oem[:-len(suffix)]
-
-    # Peugeot/Citroen/DS
-    elif brand in ('PEUGEOT', 'CITROEN', 'DS'):
-        if len(oem) >= 8:
-            return oem[:-2]
-
-    # KIA/Hyundai
-    elif brand in ('KIA', 'HYUNDAI'):
-        if len(oem) >= 8:
-            return oem[:-3]
-
-    # Mazda
-    elif brand == 'MAZDA':
-        if len(oem) >= 5:
-            return oem[:-1]
-
-    # Cupra
-    elif brand == 'CUPRA':
-        match = re.match(r'^(.+?)(P[0-9X][0-9A-Z]|PF[0-9]).*$', oem)
-        if match and len(match.group(1)) >= 5:
-            return match.group(1)
-
-    # MG
-    elif brand == 'MG':
-        match = re.match(r'^(.+?)(BJAY|WSB|JAY|JAB|LMD|LJAY|SSA|YGM|RSJ)$', oem)
-        if match and len(match.group(1)) >= 8:
-            return match.group(1)
-
-    return None
+    cleaner = OEM_CLEANERS.get((brand or '').upper().strip())
+    if cleaner is None:
+        return None
+    return cleaner(oem.upper().strip())
@@ -5,6 +5,7 @@ Vehicle Class Identification - v4
 Identifies whether a vehicle is a CAR or LCV (Light Commercial Vehicle).
 """
 
+import re
 from typing import Optional
 
 
@@ -17,6 +18,12 @@ class VehicleClass:
     LCV = 'LCV'
 
 
+# Return values of identify_vehicle_class, bound once to skip the class
+# attribute lookup on every call
+_CAR = VehicleClass.CAR
+_LCV = VehicleClass.LCV
+
+
 # LCV-only makes (these brands only produce commercial vehicles)
 LCV_MAKES = frozenset([
     'IVECO',
@@ -26,7 +33,7 @@ LCV_MAKES = frozenset([
 ])
 
 
-# LCV model name patterns (case-insensitive substring match)
+# LCV model name patterns (substring match against the lowercased model)
 LCV_MODELS = frozenset([
     'ducato',
     'daily',
@@ -57,6 +64,9 @@ LCV_MODELS = frozenset([
     'tourneo',
 ])
 
+# All LCV model patterns as one alternation, so a model is scanned once
+_LCV_MODEL_RE = re.compile('|'.join(re.escape(m) for m in sorted(LCV_MODELS)))
+
 
 # LCV body types
 LCV_BODY_TYPES = frozenset([
@@ -85,28 +95,28 @@ def identify_vehicle_class(
     3. LCV body types (VAN, CHASSIS, PICKUP, PLATFORM)
     4. Default: CAR
 
+    Inputs are expected already case-normalized (as done once per record or
+    search by the callers), so no case conversion happens here.
+
     Args:
         normalized_make: Normalized make name (uppercase)
-        normalized_model: Normalized model name (any case)
-        normalized_body_type: Normalized body type (uppercase)
+        normalized_model: Normalized model name (lowercase)
+        normalized_body_type: Normalized body type (uppercase, from normalize_body)
 
     Returns:
         VehicleClass.CAR or VehicleClass.LCV
     """
     # Rule 1: LCV-only makes
-    if normalized_make and normalized_make.upper() in LCV_MAKES:
-        return VehicleClass.LCV
+    if normalized_make in LCV_MAKES:
+        return _LCV
 
-    # Rule 2: LCV model names (case-insensitive substring match)
-    if normalized_model:
-        model_lower = normalized_model.lower()
-        for lcv_model in LCV_MODELS:
-            if lcv_model in model_lower:
-                return VehicleClass.LCV
+    # Rule 2: LCV model names (substring match)
+    if normalized_model and _LCV_MODEL_RE.search(normalized_model):
+        return _LCV
 
     # Rule 3: LCV body types
-    if normalized_body_type and normalized_body_type.upper() in LCV_BODY_TYPES:
-        return VehicleClass.LCV
+    if normalized_body_type in LCV_BODY_TYPES:
+        return _LCV
 
     # Rule 4: Default to CAR
-    return VehicleClass.CAR
+    return _CAR